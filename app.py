@@ -1,12 +1,51 @@
-import streamlit as st
+import os
 import random
 import time
+from functools import partial
+from uuid import uuid4
+
+import numpy as np
+import streamlit as st
+from fastpath import DISTRIBUTIONS, generate, summarize
+from graphs import GRAPH_ALGORITHMS, VISITED, grid, random_walls, states
+from heaps import HEAP_OPERATIONS
+from instrument import Stats, instrumented, profile
+from race import LANES, LOCKSTEP, run_race, standings
+from render import BarStream, StateTracker, bar_stream, color_bars, pick_renderer, player_payload, race_payload, race_player, render_legend, render_race_table, render_cache_stats, render_load, render_stats, render_summary, trace_player
+from scheduler import count_steps
+from searches import SEARCHES
+from serving import MAX_ACTIVE, AnimationPool
+from sorts import ALGORITHMS, SPECS, VARIANTS, resolve
+from timeline import Timeline
+from tracecache import TraceCache, trace_key
+from tracing import SORTED, record
 
 st.set_page_config(page_title="Sorting Visualizer UI", layout="wide", page_icon="⚙️")
 
-st.markdown("""
-<script src="https://cdn.tailwindcss.com"></script>
-<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;800&display=swap" rel="stylesheet">
+@st.cache_resource
+def trace_cache():
+    # one per server process, shared by every session; set DSA_TRACE_DIR to keep traces across restarts
+    return TraceCache(int(os.environ.get("DSA_TRACE_BUDGET_MB", 256)) << 20, os.environ.get("DSA_TRACE_DIR"))
+
+@st.cache_resource
+def animations():
+    # live animations of every session share these slots; DSA_MAX_ANIMATIONS caps how many run at once
+    return AnimationPool(int(os.environ.get("DSA_MAX_ANIMATIONS", MAX_ACTIVE)))
+
+@st.cache_resource(max_entries=4)
+def timeline_index(key, spec, _arr):
+    # snapshots for the scrubber, built once per recorded trace
+    return Timeline(trace_cache().record(spec, _arr))
+
+def seek_index(spec, arr):
+    # what the scrubber seeks through: a trace on disk is read in place, inflating only the chunk that holds
+    # the step (the trace cache keeps a few such files open); otherwise snapshots over the trace in memory
+    key = trace_key(spec, arr)
+    on_disk = trace_cache().open(key)
+    return on_disk if on_disk is not None else timeline_index(key, spec, arr)
+
+# built once at import; a rerun only sends them again
+STYLE = """<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;800&display=swap" rel="stylesheet">
 <style>
     :root{--bg-color:#0b0f19;--sidebar-bg:#111827;--accent:#3b82f6;--text-main:#f3f4f6;--text-muted:#9ca3af}
     html,body,[class*="css"]{font-family:'Inter',sans-serif!important}
@@ -20,194 +59,277 @@ st.markdown("""
     .stButton>button:active{transform:translateY(0)!important}
     .block-container{padding-top:2rem!important;max-width:1200px!important}
 </style>
-""", unsafe_allow_html=True)
-
-THEME = {
-    "unsorted": {"bg": "#0ea5e9", "glow": "rgba(14,165,233,0.5)", "border": "#0284c7"},
-    "comparing": {"bg": "#ec4899", "glow": "rgba(236,72,153,0.6)", "border": "#db2777"},
-    "pivot": {"bg": "#eab308", "glow": "rgba(234,179,8,0.6)", "border": "#ca8a04"},
-    "sorted": {"bg": "#10b981", "glow": "rgba(16,185,129,0.5)", "border": "#059669"},
-}
-
-def color_bars(arr, highlights, pivots, sorted_indices):
-    max_val = max(arr) if arr else 1
-    n = len(arr)
-    font_size = "14px" if n <= 20 else "12px" if n <= 35 else "10px" if n <= 50 else "8px"
-    
-    bars = '<div style="background:#111827;border:1px solid #1f2937;border-radius:16px;padding:24px;box-shadow:0 10px 25px rgba(0,0,0,0.5)"><div style="display:flex;align-items:flex-end;justify-content:center;height:500px;gap:4px">'
-    
-    for i, val in enumerate(arr):
-        state = "sorted" if i in sorted_indices else "comparing" if i in highlights else "pivot" if i in pivots else "unsorted"
-        c = THEME[state]
-        h = max(5, int((val / max_val) * 100))
-        bars += f'<div style="flex:1;height:{h}%;background:linear-gradient(180deg,{c["bg"]} 0%,{c["border"]} 100%);border-radius:8px 8px 0 0;box-shadow:0 -4px 15px {c["glow"]},inset 0 2px 4px rgba(255,255,255,0.3);display:flex;justify-content:center;align-items:flex-start;transition:height 0.15s ease"><span style="color:white;font-weight:800;font-size:{font_size};margin-top:6px;text-shadow:1px 1px 2px rgba(0,0,0,0.8)">{val}</span></div>'
-    
-    return bars + '</div></div>'
-
-def render_legend():
-    items = [(k, v) for k, v in THEME.items()]
-    legend = '<div style="display:flex;justify-content:center;gap:30px;margin-top:20px;padding:15px;background:#111827;border-radius:12px;border:1px solid #1f2937">'
-    for name, c in items:
-        legend += f'<div style="display:flex;align-items:center;gap:10px"><div style="width:16px;height:16px;border-radius:4px;background:{c["bg"]};box-shadow:0 0 10px {c["glow"]}"></div><span style="color:#d1d5db;font-weight:600;font-size:14px">{name.capitalize()}</span></div>'
-    return legend + '</div>'
-
-def bubble_sort(arr):
-    n = len(arr)
-    sorted_idx = []
-    yield arr, [], [], sorted_idx
-    for i in range(n):
-        for j in range(n - i - 1):
-            yield arr, [j, j+1], [], sorted_idx
-            if arr[j] > arr[j + 1]:
-                arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                yield arr, [j, j+1], [], sorted_idx
-        sorted_idx.append(n - i - 1)
-        if n-i-1 == 0: sorted_idx.append(0)
-    yield arr, [], [], list(range(n))
-
-def insertion_sort(arr):
-    n = len(arr)
-    sorted_idx = [0]
-    yield arr, [], [], sorted_idx
-    for i in range(1, n):
-        key, j = arr[i], i - 1
-        while j >= 0 and key < arr[j]:
-            yield arr, [j, j+1], [], sorted_idx
-            arr[j + 1] = arr[j]
-            j -= 1
-        arr[j + 1] = key
-        sorted_idx.append(i)
-        yield arr, [j+1], [], sorted_idx
-    yield arr, [], [], list(range(n))
-
-def selection_sort(arr):
-    n = len(arr)
-    sorted_idx = []
-    yield arr, [], [], sorted_idx
-    for i in range(n):
-        min_idx = i
-        for j in range(i + 1, n):
-            yield arr, [min_idx, j], [], sorted_idx
-            if arr[j] < arr[min_idx]:
-                min_idx = j
-        arr[i], arr[min_idx] = arr[min_idx], arr[i]
-        sorted_idx.append(i)
-        yield arr, [], [], sorted_idx
-    yield arr, [], [], list(range(n))
-
-def merge_sort(arr):
-    n = len(arr)
-    def merge(arr, l, m, r):
-        L, R = arr[l:m+1], arr[m+1:r+1]
-        i = j = 0
-        k = l
-        while i < len(L) and j < len(R):
-            yield arr, [k], [], []
-            arr[k] = L[i] if L[i] <= R[j] else R[j]
-            i, j = (i+1, j) if L[i] <= R[j] else (i, j+1)
-            k += 1
-        while i < len(L):
-            arr[k] = L[i]
-            i += 1
-            k += 1
-            yield arr, [k-1], [], []
-        while j < len(R):
-            arr[k] = R[j]
-            j += 1
-            k += 1
-            yield arr, [k-1], [], []
-        yield arr, list(range(l, r+1)), [], []
-    
-    def helper(arr, l, r):
-        if l < r:
-            m = l + (r - l) // 2
-            yield from helper(arr, l, m)
-            yield from helper(arr, m + 1, r)
-            yield from merge(arr, l, m, r)
-    
-    yield arr, [], [], []
-    yield from helper(arr, 0, n - 1)
-    yield arr, [], [], list(range(n))
-
-def quick_sort(arr):
-    n = len(arr)
-    sorted_idx = []
-    
-    def partition(arr, low, high):
-        pivot = arr[high]
-        i = low - 1
-        for j in range(low, high):
-            yield arr, [j], [high], sorted_idx
-            if arr[j] < pivot:
-                i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-                yield arr, [i, j], [high], sorted_idx
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        yield arr, [i+1, high], [high], sorted_idx
-        return i + 1, []
-    
-    def helper(arr, low, high):
-        if low < high:
-            pi, _ = yield from partition(arr, low, high)
-            sorted_idx.append(pi)
-            yield from helper(arr, low, pi - 1)
-            yield from helper(arr, pi + 1, high)
-        elif low == high:
-            sorted_idx.append(low)
-            yield arr, [], [], sorted_idx
-    
-    yield arr, [], [], sorted_idx
-    yield from helper(arr, 0, n - 1)
-    yield arr, [], [], list(range(n))
+"""
+HEADER = '<div style="text-align:center;margin-bottom:2rem"><h1 style="color:#f3f4f6;font-size:3rem;font-weight:800;margin:0;text-shadow:0 0 20px rgba(59,130,246,0.5)">Algorithm Visualizer</h1><p style="color:#9ca3af;font-size:1.1rem;margin-top:0.5rem">High-performance sorting engine visualization</p></div>'
+
+# roughly logarithmic; past a few hundred bars the renderers switch to level-of-detail buckets
+DENSITIES = (10, 20, 30, 40, 50, 60, 100, 200, 500, 1000, 2000, 5000, 10_000, 20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000)
+# largest input each way of running takes, for n log n sorts and for quadratic ones: a browser or race run
+# records every step on the script thread and ships them all in one message, a live run plays them all.
+# Past these only "Skip to result" runs, since it needs no frames at all
+LIMITS = {"In browser": (100_000, 2_000), "Race": (100_000, 2_000), "Live from server": (200_000, 5_000)}
+QUADRATIC = {"Bubble Sort", "Insertion Sort", "Selection Sort", "Quick Sort:Classic (last element)"}
+PACING = {"Follow speed slider": None, "Fit run into 5 s": 5, "Fit run into 15 s": 15, "Fit run into 60 s": 60}
+# every family runs on the same frame pipeline; the ones past sorting are recorded whole and played in the browser
+FAMILIES = {"Sorting": ALGORITHMS, "Searching": SEARCHES, "Heap operations": HEAP_OPERATIONS, "Pathfinding": GRAPH_ALGORITHMS}
+GRIDS = (10, 20, 50, 100, 200, 500, 1000)
+RATES = (5, 10, 30, 60, 120, 300, 1000, 3000, 10_000)
+
+def size_limit(mode, specs):
+    if mode not in LIMITS:
+        return None
+    limit = LIMITS[mode][any(spec in QUADRATIC for spec in specs)]
+    # every lane's trace goes out in the one race message, so the lanes share a single run's budget
+    return limit // max(1, len(specs)) if mode == "Race" else limit
+
+def new_array(distribution, size):
+    # a fresh input, and nothing left over from runs on the old one
+    st.session_state.arr = generate(distribution, size).tolist()
+    st.session_state.distribution = distribution
+    st.session_state.sorting = False
+    st.session_state.timeline = None
+    st.session_state.stats = None
+    st.session_state.summary = None
+    st.session_state.race = None
+    st.session_state.traced = None
+
+def label(text):
+    st.markdown(f"<p style='color:#9ca3af;font-weight:600;margin-bottom:0.25rem'>{text}</p>", unsafe_allow_html=True)
+
+def explore(family):
+    registry = FAMILIES[family]
+    with st.sidebar:
+        label("ALGORITHM")
+        name = st.selectbox("Algorithm", tuple(registry), label_visibility="collapsed")
+        st.markdown("<br>", unsafe_allow_html=True)
+        if family == "Pathfinding":
+            label("GRID")
+            size = st.select_slider("Grid", GRIDS, 50, format_func=lambda s: f"{s} × {s}", label_visibility="collapsed")
+            density = st.slider("Walls", 0.0, 0.4, 0.25, 0.05, label_visibility="collapsed")
+            weighted = st.toggle("Weighted cells")
+        else:
+            label("ARRAY DENSITY")
+            size = st.select_slider("Array Density", DENSITIES[:DENSITIES.index(100_000) + 1], 30, format_func="{:,}".format, label_visibility="collapsed")
+        st.markdown("<br>", unsafe_allow_html=True)
+        label("STEPS PER SECOND")
+        rate = st.select_slider("Steps per second", RATES, 30, format_func="{:,}".format, label_visibility="collapsed")
+        st.markdown("<br>", unsafe_allow_html=True)
+        run = st.button("Run")
+
+    if run:
+        if family == "Pathfinding":
+            n, rng = size * size, np.random.default_rng()
+            # the corners and their neighbours stay open, so a path is rarely walled off at either end
+            walls = random_walls(size, size, density, rng, keep=(0, 1, size, n - 1, n - 2, n - 1 - size))
+            graph = grid(size, size, walls, rng.integers(1, 10, (size, size)) if weighted else None)
+            algorithm, arr = partial(registry[name], graph=graph, source=0, target=n - 1), states(n, walls)
+        elif family == "Searching":
+            arr = np.sort(generate("Uniform", size, high=max(100, 2 * size))).tolist()
+            # now and then a target that is not there, to show a search giving up
+            algorithm = partial(registry[name], target=random.choice(arr) if random.random() < 0.8 else -1)
+        else:
+            arr, algorithm = generate("Uniform", size).tolist(), registry[name]
+        t0 = time.perf_counter()
+        trace = record(algorithm, arr)
+        elapsed = time.perf_counter() - t0
+        hits = int(np.count_nonzero(np.frombuffer(trace.ops, np.uint8) == SORTED))
+        if family == "Pathfinding":
+            note = f"{trace.final.count(VISITED):,} cells visited · " + (f"path of {hits:,} cells" if hits else "no path")
+        elif family == "Searching":
+            note = "found" if hits else "not found"
+        else:
+            note = f"{hits:,} popped" if hits else "heap built"
+        st.session_state.explore_id = st.session_state.get("explore_id", 0) + 1
+        payload = player_payload(trace, st.session_state.explore_id, grid=size if family == "Pathfinding" else None)
+        st.session_state.explored = (family, payload, f"{len(trace):,} steps recorded in {elapsed:.2f} s · {note}")
+
+    explored = st.session_state.get("explored")
+    if explored and explored[0] == family:
+        _, payload, note = explored
+        trace_player(payload, rate)
+        st.markdown(render_legend(grid=family == "Pathfinding"), unsafe_allow_html=True)
+        st.markdown(f"<p style='color:#9ca3af;text-align:center;font-size:13px'>{note}</p>", unsafe_allow_html=True)
 
 def main():
-    st.markdown('<div style="text-align:center;margin-bottom:2rem"><h1 style="color:#f3f4f6;font-size:3rem;font-weight:800;margin:0;text-shadow:0 0 20px rgba(59,130,246,0.5)">Algorithm Visualizer</h1><p style="color:#9ca3af;font-size:1.1rem;margin-top:0.5rem">High-performance sorting engine visualization</p></div>', unsafe_allow_html=True)
+    st.markdown(STYLE + HEADER, unsafe_allow_html=True)
 
     with st.sidebar:
         st.markdown('<h2 style="color:#f3f4f6;font-size:1.5rem;font-weight:800;margin-bottom:2rem;border-bottom:2px solid #1f2937;padding-bottom:0.5rem">Control Panel</h2>', unsafe_allow_html=True)
-        st.markdown("<p style='color:#9ca3af;font-weight:600;margin-bottom:0.25rem'>ALGORITHM</p>", unsafe_allow_html=True)
-        algorithm = st.selectbox("Algorithm", ("Bubble Sort", "Insertion Sort", "Selection Sort", "Merge Sort", "Quick Sort"), label_visibility="collapsed")
+        label("FAMILY")
+        family = st.selectbox("Family", tuple(FAMILIES), label_visibility="collapsed")
+        st.markdown("<br>", unsafe_allow_html=True)
+    if family != "Sorting":
+        return explore(family)
+
+    with st.sidebar:
+        label("ALGORITHM")
+        algorithm = st.selectbox("Algorithm", tuple(ALGORITHMS), label_visibility="collapsed")
+        variant = st.selectbox("Variant", tuple(VARIANTS[algorithm]), label_visibility="collapsed") if algorithm in VARIANTS else None
         st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown("<p style='color:#9ca3af;font-weight:600;margin-bottom:0.25rem'>ARRAY DENSITY</p>", unsafe_allow_html=True)
-        array_size = st.slider("Array Density", 10, 60, 30, label_visibility="collapsed")
+        label("ARRAY DENSITY")
+        array_size = st.select_slider("Array Density", DENSITIES, 30, format_func="{:,}".format, label_visibility="collapsed")
+        distribution = st.selectbox("Distribution", DISTRIBUTIONS, label_visibility="collapsed")
         st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown("<p style='color:#9ca3af;font-weight:600;margin-bottom:0.25rem'>EXECUTION SPEED</p>", unsafe_allow_html=True)
-        speed = st.slider("Execution Speed", 0.1, 2.0, 1.5, 0.1, label_visibility="collapsed")
-        st.markdown("<br><br>", unsafe_allow_html=True)
+        label("EXECUTION SPEED")
+        # steps per second; past the scheduler's frame rate several steps share a painted frame
+        rate = st.select_slider("Execution Speed", RATES, 10, format_func="{:,} steps/s".format, label_visibility="collapsed")
+        pacing = st.selectbox("Pacing", tuple(PACING), label_visibility="collapsed")
+        st.markdown("<br>", unsafe_allow_html=True)
+        label("RENDERER")
+        renderer = st.selectbox("Renderer", ("Auto", "Incremental", "Canvas", "Full HTML"), label_visibility="collapsed")
+        st.markdown("<br>", unsafe_allow_html=True)
+        label("PLAYBACK")
+        playback = st.selectbox("Playback", ("In browser", "Live from server", "Skip to result"), label_visibility="collapsed")
+        scrub_box = st.container()
+        st.markdown("<br>", unsafe_allow_html=True)
+        counters = st.toggle("Operation counters")
+        racing = st.toggle("Race mode")
+        if racing:
+            lanes = st.multiselect("Lanes", SPECS, default=["Merge Sort", "Quick Sort", "Heap Sort", "Tim Sort"], max_selections=LANES[1], label_visibility="collapsed")
+            lockstep = st.selectbox("Lock-step", tuple(LOCKSTEP), label_visibility="collapsed")
+        st.markdown("<br>", unsafe_allow_html=True)
+        spec = f"{algorithm}:{variant}" if variant else algorithm
+        limit = size_limit("Race" if racing else playback, lanes if racing else [spec])
+        blocked = limit is not None and array_size > limit
         col1, col2 = st.columns(2)
         with col1:
             regen = st.button("Shuffle Array")
         with col2:
-            run = st.button("Run Sort")
+            run = st.button("Run Sort", disabled=blocked)
+        if blocked:
+            st.markdown(f"<p style='color:#9ca3af;font-size:13px'>{'Racing' if racing else playback} takes up to {limit:,} elements with {'these lanes' if racing else spec}; pick Skip to result or a smaller array</p>", unsafe_allow_html=True)
+        stats_ph = st.empty()
+        cache_ph = st.empty()
+        load_ph = st.empty()
 
-    if 'arr' not in st.session_state or len(st.session_state.arr) != array_size:
-        st.session_state.arr = [random.randint(5, 100) for _ in range(array_size)]
-        st.session_state.sorting = False
+    if 'arr' not in st.session_state or len(st.session_state.arr) != array_size or st.session_state.get("distribution") != distribution:
+        new_array(distribution, array_size)
     if 'sorting' not in st.session_state:
         st.session_state.sorting = False
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid4().hex
 
     if regen:
-        st.session_state.arr = [random.randint(5, 100) for _ in range(array_size)]
-        st.session_state.sorting = False
+        new_array(distribution, array_size)
     if run:
         st.session_state.sorting = True
 
+    sort = resolve(algorithm, variant)
+    if st.session_state.sorting and racing:
+        # every lane runs on its own copy of the same input; the array on screen stays as it is
+        if len(lanes) >= LANES[0]:
+            results = run_race(lanes, st.session_state.arr)
+            st.session_state.race_id = st.session_state.get("race_id", 0) + 1
+            st.session_state.race = {"payload": race_payload(results, st.session_state.race_id), "results": results}
+        st.session_state.sorting = False
+    elif st.session_state.sorting and playback == "Skip to result":
+        # no frames at all: final state and disorder measures straight from numpy
+        summary = summarize(algorithm, st.session_state.arr)
+        st.session_state.arr = summary.pop("final").tolist()
+        st.session_state.summary = summary
+        st.session_state.timeline = None
+        st.session_state.sorting = False
+    elif st.session_state.sorting and playback == "In browser":
+        # run to completion up front and hand the whole timeline to the browser; no sleeping on this thread
+        trace = trace_cache().record(spec, st.session_state.arr)
+        st.session_state.traced = (spec, st.session_state.arr)
+        st.session_state.timeline_steps = len(trace)
+        st.session_state.stats = profile(sort, st.session_state.arr).as_dict() if counters else None
+        st.session_state.timeline_id = st.session_state.get("timeline_id", 0) + 1
+        st.session_state.timeline = player_payload(trace, st.session_state.timeline_id)
+        st.session_state.arr = trace.final
+        st.session_state.sorting = False
+
+    scrub = None
+    if playback == "In browser" and not racing and st.session_state.timeline and st.session_state.get("traced"):
+        with scrub_box:
+            if st.toggle("Scrub timeline"):
+                scrub = st.slider("Step", 0, st.session_state.timeline_steps - 1, 0, label_visibility="collapsed")
+
     canvas_ph = st.empty()
     legend_ph = st.empty()
+    status_ph = st.empty()
 
-    if not st.session_state.sorting:
-        canvas_ph.markdown(color_bars(st.session_state.arr, [], [], []), unsafe_allow_html=True)
+    mode = pick_renderer(renderer, array_size)
+
+    def render(frame, stream, tracker):
+        if mode == "Full HTML":
+            tracker.update(*frame[1:])
+            return color_bars(*frame, states=tracker.states)
+        return stream(*frame)
+
+    def ship(payload, seq):
+        if mode == "Full HTML":
+            canvas_ph.markdown(payload, unsafe_allow_html=True)
+        else:
+            with canvas_ph:
+                bar_stream(payload, key=f"bars-{seq}")
+
+    def draw(frame, stream, tracker):
+        ship(render(frame, stream, tracker), stream.seq)
+
+    if counters and st.session_state.stats:
+        stats_ph.markdown(render_stats(st.session_state.stats), unsafe_allow_html=True)
+    elif playback == "Skip to result" and st.session_state.get("summary"):
+        stats_ph.markdown(render_summary(st.session_state.summary), unsafe_allow_html=True)
+    if counters:
+        cache_ph.markdown(render_cache_stats(trace_cache().stats()), unsafe_allow_html=True)
+        load_ph.markdown(render_load(animations().metrics()), unsafe_allow_html=True)
+
+    if racing and st.session_state.get("race"):
+        race, lock = st.session_state.race, LOCKSTEP[lockstep]
+        longest = max(r["steps"] for r in race["results"])
+        with canvas_ph:
+            race_player(race["payload"], lock, rate if PACING[pacing] is None else longest / PACING[pacing], PACING[pacing] or 10)
+        legend_ph.markdown(render_legend(), unsafe_allow_html=True)
+        status_ph.markdown(render_race_table(race["results"], standings(race["results"], lock)), unsafe_allow_html=True)
+    elif racing:
+        draw((st.session_state.arr, [], [], []), BarStream(binary=mode == "Canvas"), StateTracker(array_size))
+        legend_ph.markdown(render_legend(), unsafe_allow_html=True)
+        status_ph.markdown(f"<p style='color:#9ca3af;text-align:center;font-size:13px'>Pick {LANES[0]} to {LANES[1]} lanes and press Run Sort to race them on this array</p>", unsafe_allow_html=True)
+    elif not st.session_state.sorting and st.session_state.timeline and scrub is not None:
+        spec, initial = st.session_state.traced
+        index = seek_index(spec, initial)
+        t0 = time.perf_counter()
+        frame = index.frame_at(scrub)
+        seek_ms = (time.perf_counter() - t0) * 1e3
+        draw(frame, BarStream(binary=mode == "Canvas"), StateTracker(array_size))
+        legend_ph.markdown(render_legend(), unsafe_allow_html=True)
+        status_ph.markdown(f"<p style='color:#9ca3af;text-align:center;font-size:13px'>step {scrub + 1} of {len(index)} · rebuilt in {seek_ms:.1f} ms from a snapshot every {index.K} steps</p>", unsafe_allow_html=True)
+    elif not st.session_state.sorting and st.session_state.timeline:
+        with canvas_ph:
+            trace_player(st.session_state.timeline, rate if PACING[pacing] is None else st.session_state.timeline_steps / PACING[pacing])
+        legend_ph.markdown(render_legend(), unsafe_allow_html=True)
+    elif not st.session_state.sorting:
+        draw((st.session_state.arr, [], [], []), BarStream(binary=mode == "Canvas"), StateTracker(array_size))
         legend_ph.markdown(render_legend(), unsafe_allow_html=True)
 
     if st.session_state.sorting:
         arr_copy = st.session_state.arr.copy()
-        gens = {"Bubble Sort": bubble_sort, "Insertion Sort": insertion_sort, "Selection Sort": selection_sort, "Merge Sort": merge_sort, "Quick Sort": quick_sort}
-        
-        for frame in gens[algorithm](arr_copy):
-            canvas_ph.markdown(color_bars(*frame), unsafe_allow_html=True)
-            legend_ph.markdown(render_legend(), unsafe_allow_html=True)
-            time.sleep(max(0.01, 2.05 - speed))
+        st.session_state.timeline = None
+        stream, tracker = BarStream(binary=mode == "Canvas"), StateTracker(len(arr_copy))
+        stats = Stats()
+        frames = instrumented(sort, arr_copy, stats) if counters else sort(arr_copy)
+        if PACING[pacing] is not None:
+            rate = count_steps(sort, arr_copy) / PACING[pacing]
+
+        # pacing and rendering happen on the shared pool; this thread only ships payloads, and a rerun that
+        # stops it cancels the animation on the way out
+        legend_ph.markdown(render_legend(), unsafe_allow_html=True)
+        with animations().animate(st.session_state.session_id, frames, rate, lambda frame: render(frame, stream, tracker)) as anim:
+            if anim.waiting:
+                load = animations().metrics()
+                status_ph.markdown(f"<p style='color:#9ca3af;text-align:center;font-size:13px'>waiting for a free animation slot · {load['active']} of {load['limit']} running, {load['waiting']} waiting</p>", unsafe_allow_html=True)
+            done = 0
+            for payload, steps in anim:
+                done += steps
+                ship(payload, anim.shipped)
+                status_ph.markdown(f"<p style='color:#9ca3af;text-align:center;font-size:13px'>step {done} · this frame covers {steps} step{'s' if steps > 1 else ''} · {anim.shipped + 1} frames rendered</p>", unsafe_allow_html=True)
+                if counters:
+                    stats_ph.markdown(render_stats(stats.as_dict()), unsafe_allow_html=True)
+                    load_ph.markdown(render_load(animations().metrics()), unsafe_allow_html=True)
 
+        st.session_state.stats = stats.as_dict() if counters else None
         st.session_state.sorting = False
         st.session_state.arr = arr_copy
 
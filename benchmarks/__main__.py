@@ -0,0 +1,64 @@
+import argparse
+import json
+import sys
+
+from benchmarks.harness import DISTRIBUTIONS, check_regressions, lookup, run_suite, to_csv, to_json
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the sorting generators headlessly")
+    p.add_argument("--algorithms", nargs="+", metavar="NAME", help='default: all; "Name:Variant" picks a preset, e.g. "Shell Sort:Knuth gaps"')
+    p.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--max-frames", type=int, default=5_000_000, help="abandon a run after this many frames")
+    p.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    p.add_argument("--no-counts", action="store_true", help="skip the comparison/write counting pass")
+    p.add_argument("--format", choices=("table", "json", "csv"), default="table")
+    p.add_argument("--output", help="write results here instead of stdout")
+    p.add_argument("--baseline", help="JSON results of an earlier run to check against")
+    p.add_argument("--frame-ratio", type=float, default=1.5)
+    p.add_argument("--time-ratio", type=float, default=1.8)
+    args = p.parse_args(argv)
+    for spec in args.algorithms or ():
+        try:
+            lookup(spec)
+        except ValueError as e:
+            p.error(str(e))
+
+    rows = run_suite(args.algorithms, args.distributions, args.sizes, args.seed,
+                     max_frames=args.max_frames, memory=not args.no_memory, counts=not args.no_counts)
+    if args.format == "json":
+        text = to_json(rows)
+    elif args.format == "csv":
+        text = to_csv(rows)
+    else:
+        w = max([15] + [len(r["algorithm"]) + 2 for r in rows])
+        lines = [f"{'algorithm':<{w}}{'distribution':<13}{'n':>9}{'seconds':>10}{'frames':>12}{'comparisons':>13}{'writes':>11}{'swaps':>10}{'depth':>7}{'aux':>9}{'peak KiB':>10}"]
+        for r in rows:
+            if r["error"]:
+                lines.append(f"{r['algorithm']:<{w}}{r['distribution']:<13}{r['n']:>9}  {r['error']}")
+                continue
+            cells = [f"{r['seconds']:.4f}", r["frames"], r["comparisons"], r["writes"], r["swaps"], r["max_depth"], r["aux_peak"],
+                     None if r["peak_bytes"] is None else r["peak_bytes"] // 1024]
+            lines.append(f"{r['algorithm']:<{w}}{r['distribution']:<13}{r['n']:>9}" + "".join(f"{'-' if c is None else c:>{w}}" for c, w in zip(cells, (10, 12, 13, 11, 10, 7, 9, 10))))
+            if r["phases"]:
+                lines.append(" " * (w + 22) + "  ".join(f"{k} {v * 1e3:.2f}ms" for k, v in r["phases"].items()))
+        text = "\n".join(lines) + "\n"
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = check_regressions(rows, json.load(f), args.frame_ratio, args.time_ratio)
+        for line in problems:
+            print("REGRESSION", line, file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
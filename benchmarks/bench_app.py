@@ -0,0 +1,65 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from streamlit import config
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def compile_ms():
+    t0 = time.perf_counter()
+    ScriptCache().get_bytecode(APP)
+    return (time.perf_counter() - t0) * 1e3
+
+
+def timed(at, compiled=0):
+    t0 = time.perf_counter()
+    at.run()
+    ms = (time.perf_counter() - t0) * 1e3 - compiled
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return ms
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Startup and per-rerun latency of app.py, driven through Streamlit's AppTest")
+    p.add_argument("--reruns", type=int, default=20, help="scripted reruns per interaction")
+    p.add_argument("--startup-budget", type=float, default=1500, help="ms for the first run, imports included")
+    p.add_argument("--rerun-budget", type=float, default=30, help="ms for the median rerun of each interaction")
+    args = p.parse_args(argv)
+
+    # AppTest compiles the script on every run, a server only on the first; reruns are reported without it
+    os.chdir(os.path.dirname(APP))
+    compiled = statistics.median(compile_ms() for _ in range(5))
+    at = AppTest.from_file(APP, default_timeout=120)
+    startup = timed(at)
+    sidebar = lambda widgets, label: next(w for w in widgets if w.label == label)
+    interactions = {
+        "no change": lambda i: None,
+        "drag density": lambda i: sidebar(at.sidebar.select_slider, "Array Density").set_value((20, 30, 40, 50, 60)[i % 5]),
+        "drag speed": lambda i: sidebar(at.sidebar.select_slider, "Execution Speed").set_value((10, 60, 1000)[i % 3]),
+        "switch algorithm": lambda i: sidebar(at.sidebar.selectbox, "Algorithm").set_value(("Merge Sort", "Heap Sort")[i % 2]),
+        "switch renderer": lambda i: sidebar(at.sidebar.selectbox, "Renderer").set_value(("Canvas", "Full HTML")[i % 2]),
+    }
+    print(f"{'first run':<18}{startup:>9.1f}ms   budget {args.startup_budget:.0f}ms   "
+          f"(compile {compiled:.1f}ms, magic {'on' if config.get_option('runner.magicEnabled') else 'off'})")
+    over = startup > args.startup_budget
+    for label, interact in interactions.items():
+        times = []
+        for i in range(args.reruns):
+            interact(i)
+            times.append(timed(at, compiled))
+        median = statistics.median(times)
+        over |= median > args.rerun_budget
+        print(f"{label:<18}{median:>9.1f}ms   max {max(times):7.1f}ms   budget {args.rerun_budget:.0f}ms"
+              f"{'   OVER' if median > args.rerun_budget else ''}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
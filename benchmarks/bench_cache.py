@@ -0,0 +1,37 @@
+import argparse
+import random
+import tempfile
+import time
+
+from tracecache import TraceCache, trace_key
+
+
+def clock(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1e3
+
+
+def main():
+    p = argparse.ArgumentParser(description="Trace cache: record vs memory hit vs disk hit, file size and seeks")
+    p.add_argument("--algorithms", nargs="+", default=["Bubble Sort", "Merge Sort", "Quick Sort", "Tim Sort"])
+    p.add_argument("--size", type=int, default=2000)
+    args = p.parse_args()
+    arr = [random.Random(0).randint(5, 100) for _ in range(args.size)]
+    print(f"{'':<16}{'steps':>9}{'record':>11}{'memory':>10}{'disk':>11}{'seek':>9}{'in memory':>12}{'on disk':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for spec in args.algorithms:
+            cold = TraceCache(directory=directory)
+            trace, record_ms = clock(cold.record, spec, arr)
+            _, hit_ms = clock(cold.record, spec, arr)
+            _, disk_ms = clock(TraceCache(directory=directory).record, spec, arr)
+            tf = cold.open(trace_key(spec, arr))
+            step = len(trace) * 2 // 3
+            frame, seek_ms = clock(tf.frame_at, step)
+            assert frame[0] == trace.frame_at(step)[0], spec
+            print(f"{spec:<16}{len(trace):>9}{record_ms:>9.1f}ms{hit_ms:>8.3f}ms{disk_ms:>9.1f}ms{seek_ms:>7.1f}ms"
+                  f"{trace.nbytes / 2**20:>10.1f}MB{tf.nbytes / 2**20:>8.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
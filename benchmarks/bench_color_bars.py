@@ -0,0 +1,55 @@
+import argparse
+import random
+import time
+
+from render import THEME, StateTracker, color_bars
+
+
+def color_bars_lists(arr, highlights, pivots, sorted_indices):
+    # the pre-cache renderer: list membership per bar and a fresh f-string per bar
+    max_val = max(arr) if arr else 1
+    n = len(arr)
+    font_size = "14px" if n <= 20 else "12px" if n <= 35 else "10px" if n <= 50 else "8px"
+    bars = '<div style="background:#111827;border:1px solid #1f2937;border-radius:16px;padding:24px;box-shadow:0 10px 25px rgba(0,0,0,0.5)"><div style="display:flex;align-items:flex-end;justify-content:center;height:500px;gap:4px">'
+    for i, val in enumerate(arr):
+        state = "sorted" if i in sorted_indices else "comparing" if i in highlights else "pivot" if i in pivots else "unsorted"
+        c = THEME[state]
+        h = max(5, int((val / max_val) * 100))
+        bars += f'<div style="flex:1;height:{h}%;background:linear-gradient(180deg,{c["bg"]} 0%,{c["border"]} 100%);border-radius:8px 8px 0 0;box-shadow:0 -4px 15px {c["glow"]},inset 0 2px 4px rgba(255,255,255,0.3);display:flex;justify-content:center;align-items:flex-start;transition:height 0.15s ease"><span style="color:white;font-weight:800;font-size:{font_size};margin-top:6px;text-shadow:1px 1px 2px rgba(0,0,0,0.8)">{val}</span></div>'
+    return bars + '</div></div>'
+
+
+def timed(fn, frames, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            fn(frame)
+    return (time.perf_counter() - t0) / (repeat * len(frames))
+
+
+def main():
+    p = argparse.ArgumentParser(description="color_bars cost per frame")
+    p.add_argument("--sizes", type=int, nargs="+", default=[60, 1000, 10000])
+    p.add_argument("--frames", type=int, default=20)
+    args = p.parse_args()
+    print(f"{'n':>7}{'lists':>12}{'states':>12}{'tracker':>12}")
+    for n in args.sizes:
+        arr = [random.randint(5, 100) for _ in range(n)]
+        # a late bubble-sort frame: half the array sorted, one pair compared
+        sorted_idx = list(range(n - 1, n // 2, -1))
+        frames = [(arr, [j, j + 1], [], sorted_idx) for j in range(min(args.frames, n // 2 - 1))]
+        tracker = StateTracker(n)
+
+        def incremental(frame):
+            tracker.update(*frame[1:])
+            return color_bars(*frame, states=tracker.states)
+
+        repeat = max(1, 2000 // n)
+        lists = timed(lambda f: color_bars_lists(*f), frames, 1 if n > 1000 else repeat)
+        sets = timed(lambda f: color_bars(*f), frames, repeat)
+        incr = timed(incremental, frames, repeat)
+        print(f"{n:>7}{lists * 1e3:>10.3f}ms{sets * 1e3:>10.3f}ms{incr * 1e3:>10.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
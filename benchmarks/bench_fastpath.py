@@ -0,0 +1,39 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from fastpath import DISTRIBUTIONS, generate, inversions, runs, summarize
+from sorts import ALGORITHMS
+
+
+def clock(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1e3
+
+
+def main():
+    p = argparse.ArgumentParser(description="Vectorized generation and skip-to-result timings")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000])
+    p.add_argument("--high", type=int, default=100, help="largest generated value (the app uses 100)")
+    args = p.parse_args()
+    rng = np.random.default_rng(0)
+    print(f"{'':<16}{'n':>9}{'generate':>11}{'randint':>11}{'inversions':>12}{'runs':>8}")
+    for n in args.sizes:
+        for distribution in DISTRIBUTIONS:
+            a, gen_ms = clock(generate, distribution, n, 5, args.high, None, rng)
+            _, list_ms = clock(lambda: [random.randint(5, args.high) for _ in range(n)])
+            _, inv_ms = clock(inversions, a)
+            _, runs_ms = clock(runs, a)
+            print(f"{distribution:<16}{n:>9}{gen_ms:>9.2f}ms{list_ms:>9.2f}ms{inv_ms:>10.2f}ms{runs_ms:>6.2f}ms")
+        a = generate("Uniform", n, 5, args.high, rng=rng)
+        for name in ALGORITHMS:
+            summary, ms = clock(summarize, name, a)
+            assert (np.diff(summary["final"]) >= 0).all(), name
+            print(f"  skip to result  {name:<18}{ms:>9.2f}ms total, {summary['seconds'] * 1e3:.2f}ms in {summary['method']}")
+
+
+if __name__ == "__main__":
+    main()
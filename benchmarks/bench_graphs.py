@@ -0,0 +1,50 @@
+import argparse
+import random
+import statistics
+import time
+from functools import partial
+
+import numpy as np
+
+from graphs import GRAPH_ALGORITHMS, grid, random_walls, states
+from timeline import Timeline
+from tracing import record
+
+
+def main():
+    p = argparse.ArgumentParser(description="Pathfinding on a large grid: CSR build, recording and timeline seeks")
+    p.add_argument("--size", type=int, default=1000, help="grid is size x size")
+    p.add_argument("--walls", type=float, default=0.25)
+    p.add_argument("--weighted", action="store_true", help="cells cost 1-9 to enter")
+    p.add_argument("--algorithms", nargs="+", default=list(GRAPH_ALGORITHMS), choices=GRAPH_ALGORITHMS)
+    p.add_argument("--seeks", type=int, default=50)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+    rng = np.random.default_rng(args.seed)
+    size, n = args.size, args.size * args.size
+    walls = random_walls(size, size, args.walls, rng, keep=(0, 1, size, n - 1, n - 2, n - 1 - size))
+    t0 = time.perf_counter()
+    graph = grid(size, size, walls, rng.integers(1, 10, (size, size)) if args.weighted else None)
+    print(f"{size}x{size} grid, {len(graph.targets):,} edges: CSR built in {time.perf_counter() - t0:.2f}s, {graph.nbytes / 2**20:.1f}MB")
+    print(f"{'algorithm':<10}{'steps':>10}{'events':>11}{'record':>9}{'steps/s':>11}{'trace':>10}{'path':>7}{'index':>9}{'seek p50':>10}{'p99':>9}")
+    pick = random.Random(args.seed)
+    for name in args.algorithms:
+        t0 = time.perf_counter()
+        trace = record(partial(GRAPH_ALGORITHMS[name], graph=graph, source=0, target=n - 1), states(n, walls))
+        rec = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        timeline = Timeline(trace)
+        index = time.perf_counter() - t0
+        times = []
+        for _ in range(args.seeks):
+            t0 = time.perf_counter()
+            timeline.frame_at(pick.randrange(len(trace)))
+            times.append((time.perf_counter() - t0) * 1e3)
+        times.sort()
+        path = len(timeline.frame_at(-1)[3])
+        print(f"{name:<10}{len(trace):>10,}{len(trace.ops):>11,}{rec:>8.1f}s{len(trace) / rec:>11,.0f}{trace.nbytes / 2**20:>8.1f}MB"
+              f"{path:>7}{index:>8.2f}s{statistics.median(times):>8.1f}ms{times[int(len(times) * 0.99) - 1]:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import random
+import subprocess
+import time
+import types
+
+from instrument import Stats, instrumented
+from sorts import ALGORITHMS
+
+QUADRATIC = {"Bubble Sort", "Insertion Sort", "Selection Sort"}
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def elapsed(make_frames):
+    t0 = time.perf_counter()
+    for _ in make_frames():
+        pass
+    return time.perf_counter() - t0
+
+
+def baseline(rev):
+    # sorts.py as it was at a git revision, e.g. 9b23c9d^ for the generators before the probe hooks
+    source = subprocess.run(["git", "show", f"{rev}:sorts.py"], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    module = types.ModuleType(f"sorts@{rev}")
+    exec(compile(source, f"{rev}:sorts.py", "exec"), module.__dict__)
+    return module.ALGORITHMS
+
+
+def main():
+    p = argparse.ArgumentParser(description="Cost of the probe hooks when off, and of full instrumentation when on")
+    p.add_argument("--n", type=int, default=20000, help="size for every algorithm that is not quadratic")
+    p.add_argument("--quadratic-n", type=int, default=1000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--baseline", metavar="REV", help="also time the same-named generators from sorts.py at this git revision")
+    p.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS))
+    args = p.parse_args()
+    base = baseline(args.baseline) if args.baseline else {}
+    print(f"{'algorithm':<18}{'n':>7}{'base':>10}{'off':>10}{'off/base':>10}{'on':>10}{'on/off':>8}")
+    for name in args.algorithms:
+        algorithm = ALGORITHMS[name]
+        n = args.quadratic_n if name in QUADRATIC else args.n
+        arr = [random.randint(1, 10**6) for _ in range(n)]
+        runs = {"off": lambda: algorithm(list(arr)), "on": lambda: instrumented(algorithm, list(arr), Stats())}
+        if name in base:
+            runs["base"] = lambda: base[name](list(arr))
+        # best of repeat, interleaved so drift in the machine's speed lands on both sides of each ratio
+        best = dict.fromkeys(runs, float("inf"))
+        for _ in range(args.repeat):
+            for key, run in runs.items():
+                best[key] = min(best[key], elapsed(run))
+        off, on = best["off"], best["on"]
+        if "base" in best:
+            b = best["base"]
+            cols = f"{b:>9.3f}s{off:>9.3f}s{(off / b - 1) * 100:>+9.1f}%"
+        else:
+            cols = f"{'-':>10}{off:>9.3f}s{'-':>10}"
+        print(f"{name:<18}{n:>7}{cols}{on:>9.3f}s{on / off:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from records import sort_records
+from sorts import ALGORITHMS, SPECS, STABLE, lookup
+
+
+def log_lines(n, rng):
+    t0 = datetime(2026, 1, 1)
+    return [f"{(t0 + timedelta(seconds=rng.randrange(86400), microseconds=rng.randrange(10**6))).isoformat(timespec='milliseconds')}"
+            f" {rng.choice(('INFO', 'WARN', 'ERROR'))} request {i}" for i in range(n)]
+
+
+def timestamp(line):
+    return datetime.fromisoformat(line[:23])
+
+
+class PerComparison:
+    # what a naive key= would do: call key on both sides of every comparison
+    __slots__ = ("v", "key")
+    calls = 0
+
+    def __init__(self, v, key):
+        self.v = v
+        self.key = key
+
+    def __lt__(self, other):
+        PerComparison.calls += 2
+        return self.key(self.v) < self.key(other.v)
+
+    def __le__(self, other):
+        return not other < self
+
+    def __gt__(self, other):
+        return other < self
+
+
+def check_stability(n, seed):
+    # few distinct keys, so every algorithm meets plenty of ties; tags record the input order
+    rng = random.Random(seed)
+    recs = [(rng.randrange(5), i) for i in range(n)]
+    wrong = []
+    print(f"{'algorithm':<40}{'documented':>12}{'observed':>10}")
+    for spec in SPECS:
+        out = list(recs)
+        for _ in sort_records(spec, out, key=lambda r: r[0]):
+            pass
+        assert [r[0] for r in out] == sorted(r[0] for r in recs), spec
+        observed = out == sorted(recs)
+        claimed = spec.partition(":")[0] in STABLE
+        print(f"{spec:<40}{'stable' if claimed else '-':>12}{'stable' if observed else '-':>10}")
+        if claimed != observed:
+            wrong.append(spec)
+    return wrong
+
+
+def bench_keys(spec, n, seed):
+    lines = log_lines(n, random.Random(seed))
+    calls = 0
+
+    def key(line):
+        nonlocal calls
+        calls += 1
+        return timestamp(line)
+
+    out = list(lines)
+    t0 = time.perf_counter()
+    frames = sum(1 for _ in sort_records(spec, out, key=key))
+    once = time.perf_counter() - t0
+    assert list(map(timestamp, out)) == sorted(map(timestamp, lines)), spec
+    wrapped = [PerComparison(line, timestamp) for line in lines]
+    PerComparison.calls = 0
+    t0 = time.perf_counter()
+    for _ in lookup(spec)(wrapped):
+        pass
+    naive = time.perf_counter() - t0
+    print(f"{spec:<20}{n:>9}{frames:>11}{once:>10.3f}s{calls:>11,}{naive:>10.3f}s{PerComparison.calls:>13,}")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Record sorting: stability per algorithm, and key extraction once vs per comparison")
+    p.add_argument("--stability-size", type=int, default=300)
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    p.add_argument("--algorithms", nargs="+", default=["Merge Sort", "Quick Sort", "Tim Sort"], choices=ALGORITHMS)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+    wrong = check_stability(args.stability_size, args.seed)
+    print()
+    print(f"{'algorithm':<20}{'n':>9}{'frames':>11}{'ranked':>11}{'key calls':>11}{'naive':>11}{'key calls':>13}")
+    for n in args.sizes:
+        for spec in args.algorithms:
+            bench_keys(spec, n, args.seed)
+    for spec in wrong:
+        print("STABILITY", spec, "does not match sorts.STABLE", file=sys.stderr)
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.harness import make_input
+from sorts import bottom_up_merge_sort, in_place_merge_sort, merge_sort
+
+MODES = {"top-down": merge_sort, "bottom-up": bottom_up_merge_sort, "in-place": in_place_merge_sort}
+
+
+class AllocCounter:
+    # a probe that only tallies the auxiliary allocations the generators announce
+    def __init__(self):
+        self.allocs = 0
+        self.elements = 0
+
+    def alloc(self, elements):
+        self.allocs += 1
+        self.elements += elements
+
+    def free(self, elements):
+        pass
+
+    def enter(self, phase):
+        pass
+
+    def exit(self):
+        pass
+
+
+def bench(mode, arr):
+    algorithm = MODES[mode]
+    out = list(arr)
+    t0 = time.perf_counter()
+    frames = sum(1 for _ in algorithm(out))
+    seconds = time.perf_counter() - t0
+    assert out == sorted(arr), mode
+    out = list(arr)
+    tracemalloc.start()
+    for _ in algorithm(out):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    counter = AllocCounter()
+    for _ in algorithm(list(arr), probe=counter):
+        pass
+    return frames, seconds, peak, counter
+
+
+def main():
+    p = argparse.ArgumentParser(description="Top-down vs bottom-up vs in-place merge sort: time and allocations")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    p.add_argument("--distribution", default="random")
+    p.add_argument("--in-place-max", type=int, default=100000, help="the rotation merge does O(n log^2 n) moves")
+    args = p.parse_args()
+    print(f"{'mode':<11}{'n':>9}{'frames':>12}{'seconds':>10}{'allocs':>9}{'elements':>11}{'peak KiB':>11}")
+    for n in args.sizes:
+        arr = make_input(args.distribution, n)
+        for mode in MODES:
+            if mode == "in-place" and n > args.in_place_max:
+                continue
+            frames, seconds, peak, counter = bench(mode, arr)
+            print(f"{mode:<11}{n:>9}{frames:>12}{seconds:>10.3f}{counter.allocs:>9}{counter.elements:>11}{peak // 1024:>11}")
+
+
+if __name__ == "__main__":
+    main()
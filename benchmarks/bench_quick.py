@@ -0,0 +1,71 @@
+import argparse
+import time
+
+from benchmarks.harness import lookup, make_input, measure
+from sorts import VARIANTS
+
+ADVERSARIAL = ("sorted", "reversed", "organ-pipe", "all-equal", "few-unique", "killer")
+
+
+def antiqsort(algorithm, n):
+    # McIlroy's "killer adversary for quicksort": keys start as undecided gas and are frozen into ever
+    # larger values only when a comparison forces it, always freezing the side that looks like the pivot
+    # candidate. Replaying the frozen values makes that same algorithm do as much work as it ever will.
+    gas = n
+    val = [gas] * n
+    state = {"solid": 0, "candidate": None}
+
+    def freeze(i):
+        val[i] = state["solid"]
+        state["solid"] += 1
+
+    class Key:
+        __slots__ = ("i",)
+
+        def __init__(self, i):
+            self.i = i
+
+        def __lt__(self, other):
+            x, y = self.i, other.i
+            if val[x] == gas and val[y] == gas:
+                freeze(x if x == state["candidate"] else y)
+            if val[x] == gas:
+                state["candidate"] = x
+            elif val[y] == gas:
+                state["candidate"] = y
+            return val[x] < val[y]
+
+    for _ in algorithm([Key(i) for i in range(n)]):
+        pass
+    return val
+
+
+def main():
+    p = argparse.ArgumentParser(description="Quick sort variants on inputs chosen to hurt them")
+    p.add_argument("--variants", nargs="+", default=list(VARIANTS["Quick Sort"]), choices=tuple(VARIANTS["Quick Sort"]), metavar="VARIANT")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    p.add_argument("--distributions", nargs="+", default=list(ADVERSARIAL), choices=ADVERSARIAL)
+    p.add_argument("--max-frames", type=int, default=20_000_000)
+    args = p.parse_args()
+    print(f"{'variant':<26}{'input':<12}{'n':>7}{'seconds':>9}{'frames':>11}{'comparisons':>13}{'depth':>7}  fallback")
+    for variant in args.variants:
+        spec = f"Quick Sort:{variant}"
+        algorithm = lookup(spec)
+        for n in args.sizes:
+            for distribution in args.distributions:
+                if distribution == "killer":
+                    t0 = time.perf_counter()
+                    arr = antiqsort(algorithm, n)
+                    label = f"killer ({time.perf_counter() - t0:.1f}s to build)"
+                else:
+                    arr, label = make_input(distribution, n), distribution
+                row = measure(algorithm, arr, max_frames=args.max_frames, memory=False)
+                if row["error"]:
+                    print(f"{variant:<26}{distribution:<12}{n:>7}  {row['error']}")
+                    continue
+                print(f"{variant:<26}{distribution:<12}{n:>7}{row['seconds']:>9.3f}{row['frames']:>11}{row['comparisons']:>13}{row['max_depth']:>7}"
+                      f"  {'heap sort' if 'heap sort' in row['phases'] else '-'}{'  ' + label if distribution == 'killer' else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import os
+import time
+
+from benchmarks.harness import make_input
+from race import run_lane, run_race
+
+FAST = ["Merge Sort", "Quick Sort", "Heap Sort", "Tim Sort", "Shell Sort", "Merge Sort:Bottom-up, one buffer", "Radix Sort (LSD)", "Counting Sort"]
+
+
+def main():
+    p = argparse.ArgumentParser(description="Race lanes computed on a thread pool vs a process pool")
+    p.add_argument("--sizes", type=int, nargs="+", default=[2000, 20000])
+    p.add_argument("--lanes", type=int, nargs="+", default=[4, 8])
+    args = p.parse_args()
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'lanes':>6}{'n':>8}{'executor':>12}{'wall':>9}{'speedup':>9}{'payload MB':>12}")
+    for n in args.sizes:
+        arr = make_input("random", n)
+        for k in args.lanes:
+            t0 = time.perf_counter()
+            results = [run_lane(spec, arr) for spec in FAST[:k]]
+            serial = time.perf_counter() - t0
+            mb = sum(len(v) for r in results for v in r["trace"].values() if isinstance(v, str)) / 2**20
+            print(f"{k:>6}{n:>8}{'sequential':>12}{serial:>8.2f}s{'':>9}{mb:>12.2f}")
+            for executor in ("thread", "process"):
+                t0 = time.perf_counter()
+                run_race(FAST[:k], arr, executor)
+                wall = time.perf_counter() - t0
+                print(f"{k:>6}{n:>8}{executor:>12}{wall:>8.2f}s{serial / wall:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
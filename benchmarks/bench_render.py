@@ -0,0 +1,58 @@
+import argparse
+import json
+import random
+import time
+
+from sorts import bubble_sort, merge_sort
+from render import BarStream, color_bars
+
+ALGORITHMS = {"Bubble Sort": bubble_sort, "Merge Sort": merge_sort}
+
+
+def frames(algorithm, n, limit):
+    arr = [random.randint(5, 100) for _ in range(n)]
+    for step, frame in enumerate(algorithm(arr)):
+        if step >= limit:
+            return
+        yield frame
+
+
+def full_html(algorithm, n, limit):
+    count = size = 0
+    t0 = time.perf_counter()
+    for frame in frames(algorithm, n, limit):
+        size += len(color_bars(*frame).encode())
+        count += 1
+    return count, size, time.perf_counter() - t0
+
+
+def incremental(algorithm, n, limit, binary=False):
+    stream = BarStream(binary=binary)
+    count = size = 0
+    t0 = time.perf_counter()
+    for frame in frames(algorithm, n, limit):
+        size += len(json.dumps(stream(*frame), separators=(",", ":")))
+        count += 1
+    return count, size, time.perf_counter() - t0
+
+
+def canvas(algorithm, n, limit):
+    return incremental(algorithm, n, limit, binary=True)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Payload per frame and frames/s: full color_bars HTML vs incremental diffs")
+    p.add_argument("--sizes", type=int, nargs="+", default=[60, 1000, 10000])
+    p.add_argument("--frames", type=int, default=2000, help="frames measured per run")
+    args = p.parse_args()
+    print(f"{'algorithm':<13}{'n':>6}  {'renderer':<12}{'frames':>8}{'bytes/frame':>14}{'frames/s':>12}")
+    for n in args.sizes:
+        for name, algorithm in ALGORITHMS.items():
+            for label, run in (("full html", full_html), ("incremental", incremental), ("canvas", canvas)):
+                random.seed(n)
+                count, size, elapsed = run(algorithm, n, args.frames)
+                print(f"{name:<13}{n:>6}  {label:<12}{count:>8}{size / count:>14,.0f}{count / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import math
+import sys
+import time
+
+from benchmarks.harness import lookup, make_input
+from sorts import VARIANTS, shell_gaps
+
+
+def digits(arr, base):
+    span, d = max(arr) - min(arr), 1
+    while span >= base ** d:
+        d += 1
+    return d
+
+
+# expected growth of the frame count; the normalised columns should stay flat (or fall) as n grows
+GROWTH = {
+    "Merge Sort": ("n log n", lambda arr: len(arr) * math.log2(len(arr))),
+    "Merge Sort:Bottom-up, one buffer": ("n log n", lambda arr: len(arr) * math.log2(len(arr))),
+    "Quick Sort": ("n log n", lambda arr: len(arr) * math.log2(len(arr))),
+    "Heap Sort": ("n log n", lambda arr: len(arr) * math.log2(len(arr))),
+    "Shell Sort": ("n^1.25", lambda arr: len(arr) ** 1.25),
+    "Shell Sort:Knuth gaps": ("n^1.25", lambda arr: len(arr) ** 1.25),
+    "Tim Sort": ("n log n", lambda arr: len(arr) * math.log2(len(arr))),
+    "Counting Sort": ("n", len),
+    "Radix Sort (LSD)": ("n·d", lambda arr: len(arr) * digits(arr, 10)),
+    "Radix Sort (LSD):Base 256": ("n·d", lambda arr: len(arr) * digits(arr, 256)),
+}
+
+
+def inversions(arr):
+    # pairs i < j with arr[i] > arr[j], counted by a bottom-up merge
+    a, n, width, count = list(arr), len(arr), 1, 0
+    while width < n:
+        out = []
+        for lo in range(0, n, 2 * width):
+            left, right = a[lo:lo + width], a[lo + width:lo + 2 * width]
+            i = j = 0
+            while i < len(left) and j < len(right):
+                if right[j] < left[i]:
+                    out.append(right[j])
+                    j += 1
+                    count += len(left) - i
+                else:
+                    out.append(left[i])
+                    i += 1
+            out += left[i:] + right[j:]
+        a, width = out, 2 * width
+    return count
+
+
+def heap_sifts(n):
+    # (root, end) of every sift_down heap sort makes: heapify, then one per extraction
+    return [(r, n) for r in range(n // 2)] + [(0, end) for end in range(n - 1, 0, -1)]
+
+
+def frame_bounds(spec, arr):
+    # (fewest, most) frames spec may yield on arr, equal where the count is exact; None if unchecked
+    n = len(arr)
+    if spec == "Counting Sort":
+        return (2 * n + 2,) * 2
+    if spec.startswith("Radix Sort"):
+        return (2 * n * digits(arr, 256 if spec.endswith("Base 256") else 10) + 2,) * 2
+    if spec.startswith("Shell Sort"):
+        # one frame per element per gap, plus one per shift, and every shift removes at least one inversion
+        variant = spec.partition(":")[2]
+        kind = VARIANTS["Shell Sort"][variant]["gaps"] if variant else "ciura"
+        base = 2 + sum(max(0, n - g) for g in shell_gaps(kind, n))
+        return base, base + inversions(arr)
+    if spec == "Heap Sort":
+        # a sift yields its first level (2 frames with two children, 1 with one) then at most 3 per level;
+        # on all-equal input every sift stops after that first level
+        sifts = heap_sifts(n)
+        fewest = 2 + max(0, n - 1) + sum(2 if 2 * r + 2 < end else 1 for r, end in sifts if 2 * r + 1 < end)
+        most = 2 + max(0, n - 1) + sum(3 * ((end // (r + 1)).bit_length() - 1) for r, end in sifts)
+        return (fewest, fewest) if min(arr, default=0) == max(arr, default=0) else (fewest, most)
+    if spec.startswith("Tim Sort") and n > 1:
+        # a monotone input is one run: n - 1 comparisons, and half as many swaps if it was descending
+        if all(arr[i] <= arr[i + 1] for i in range(n - 1)):
+            return (n + 1,) * 2
+        if all(arr[i] > arr[i + 1] for i in range(n - 1)):
+            return (n + 1 + n // 2,) * 2
+    return None
+
+
+# inputs on which the bounds above are exact for heap, shell or Tim sort
+FIXED = {
+    "ascending": lambda n: list(range(n)),
+    "descending": lambda n: list(range(n, 0, -1)),
+    "all-equal": lambda n: [50] * n,
+}
+
+
+def check(spec, arr, out, frames, name):
+    bounds = frame_bounds(spec, arr)
+    if out != sorted(arr):
+        print(f"  FAILED: not sorted on {name} input")
+    elif bounds is not None and not bounds[0] <= frames <= bounds[1]:
+        expected = bounds[0] if bounds[0] == bounds[1] else f"{bounds[0]} to {bounds[1]}"
+        print(f"  FAILED: {frames} frames on {name} input of {len(arr)}, expected {expected}")
+    else:
+        return True
+    return False
+
+
+def main():
+    p = argparse.ArgumentParser(description="Frames and time per expected unit of work as n grows")
+    p.add_argument("--algorithms", nargs="+", default=list(GROWTH), choices=tuple(GROWTH), metavar="NAME")
+    p.add_argument("--distribution", default="random")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    p.add_argument("--fixed-n", type=int, default=5000, help="size of the fixed inputs whose frame counts are checked")
+    p.add_argument("--drift", type=float, default=1.5, help="largest allowed growth of frames per unit across sizes")
+    args = p.parse_args()
+    print(f"{'algorithm':<27}{'n':>9}{'frames':>12}{'seconds':>10}{'growth':>9}{'frames/unit':>13}{'ns/unit':>9}")
+    failed = False
+    for spec in args.algorithms:
+        label, unit = GROWTH[spec]
+        algorithm = lookup(spec)
+        per_unit = []
+        for n in args.sizes:
+            arr = make_input(args.distribution, n)
+            out = list(arr)
+            t0 = time.perf_counter()
+            frames = sum(1 for _ in algorithm(out))
+            seconds = time.perf_counter() - t0
+            work = unit(arr)
+            per_unit.append(frames / work)
+            print(f"{spec:<27}{n:>9}{frames:>12}{seconds:>10.3f}{label:>9}{per_unit[-1]:>13.3f}{seconds / work * 1e9:>9.0f}")
+            failed |= not check(spec, arr, out, frames, args.distribution)
+        if max(per_unit) > per_unit[0] * args.drift:
+            print(f"  FAILED: frames per {label} grew x{max(per_unit) / per_unit[0]:.2f} across sizes")
+            failed = True
+        for name, make in FIXED.items():
+            arr = make(args.fixed_n)
+            out = list(arr)
+            failed |= not check(spec, arr, out, sum(1 for _ in algorithm(out)), name)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
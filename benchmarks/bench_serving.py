@@ -0,0 +1,78 @@
+import argparse
+import random
+import threading
+import time
+
+from render import BarStream, StateTracker, color_bars
+from serving import MAX_ACTIVE, AnimationPool
+from sorts import ALGORITHMS, lookup
+
+
+def session(pool, sid, spec, arr, rate, html, restart, rng):
+    # one simulated user: Run Sort, optionally a slider drag partway through that restarts the animation
+    runs = 2 if rng.random() < restart else 1
+    for run in range(runs):
+        a = list(arr)
+        stream, tracker = BarStream(), StateTracker(len(a))
+
+        def render(frame):
+            if html:
+                tracker.update(*frame[1:])
+                return color_bars(*frame, states=tracker.states)
+            return stream(*frame)
+
+        with pool.animate(sid, lookup(spec)(a), rate, render) as anim:
+            for _ in anim:
+                if run < runs - 1 and anim.shipped >= 20:
+                    break
+
+
+def main():
+    p = argparse.ArgumentParser(description="Load test: N sessions animating at once through one AnimationPool")
+    p.add_argument("--sessions", type=int, default=50)
+    p.add_argument("--max-active", type=int, default=MAX_ACTIVE)
+    p.add_argument("--size", type=int, default=30)
+    p.add_argument("--rate", type=float, default=60, help="steps per second per animation")
+    p.add_argument("--renderer", choices=("stream", "html"), default="stream")
+    p.add_argument("--restart", type=float, default=0.2, help="share of sessions that rerun mid-animation")
+    p.add_argument("--algorithms", nargs="+", default=["Quick Sort", "Merge Sort", "Heap Sort", "Insertion Sort"], choices=ALGORITHMS)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+    rng = random.Random(args.seed)
+    pool = AnimationPool(args.max_active)
+    peak = {"active": 0, "waiting": 0}
+    done = threading.Event()
+
+    def monitor():
+        while not done.wait(0.05):
+            m = pool.metrics()
+            for k in peak:
+                peak[k] = max(peak[k], m[k])
+
+    threads = [threading.Thread(target=monitor)]
+    for i in range(args.sessions):
+        arr = [rng.randint(5, 100) for _ in range(args.size)]
+        spec = args.algorithms[i % len(args.algorithms)]
+        threads.append(threading.Thread(target=session, args=(pool, f"s{i}", spec, arr, args.rate, args.renderer == "html",
+                                                               args.restart, random.Random(rng.random()))))
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads[1:]:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    done.set()
+    threads[0].join()
+    pool.shutdown()
+
+    m = pool.metrics()
+    lat = sorted(pool.latencies())
+    pct = lambda q: lat[min(len(lat) - 1, int(len(lat) * q))] * 1e3
+    print(f"{args.sessions} sessions, {args.max_active} slots, n={args.size}, {args.rate:g} steps/s, {args.renderer} payloads")
+    print(f"elapsed {elapsed:.1f}s   peak active {peak['active']}   peak waiting {peak['waiting']}   cancelled {m['cancelled']}")
+    print(f"frames {m['frames_sent']}  ({m['frames_sent'] / elapsed:.0f}/s)   sent {m['bytes_sent'] / 2**20:.1f}MB  ({m['bytes_sent'] / elapsed / 1024:.0f}KB/s)")
+    print(f"frame latency p50 {pct(0.5):.2f}ms   p99 {pct(0.99):.2f}ms   max {lat[-1] * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
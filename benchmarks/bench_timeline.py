@@ -0,0 +1,54 @@
+import argparse
+import random
+import statistics
+import time
+
+from sorts import lookup
+from timeline import SNAPSHOT_BYTES, Timeline
+from tracing import record
+
+
+def main():
+    p = argparse.ArgumentParser(description="Timeline seeks: random access into a recorded sort")
+    p.add_argument("--algorithm", default="Merge Sort")
+    p.add_argument("--size", type=int, default=100000)
+    p.add_argument("--seeks", type=int, default=200)
+    p.add_argument("--budget-mb", type=int, default=SNAPSHOT_BYTES >> 20)
+    args = p.parse_args()
+    rng = random.Random(0)
+    arr = [rng.randint(5, 100) for _ in range(args.size)]
+    t0 = time.perf_counter()
+    trace = record(lookup(args.algorithm), arr)
+    record_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    timeline = Timeline(trace, args.budget_mb << 20)
+    index_s = time.perf_counter() - t0
+    print(f"{args.algorithm}, n={args.size}: {len(trace)} steps recorded in {record_s:.1f}s, trace {trace.nbytes / 2**20:.1f}MB")
+    print(f"index built in {index_s:.2f}s: K={timeline.K}, {len(trace) // timeline.K + 1} snapshots, {timeline.nbytes / 2**20:.1f}MB")
+
+    targets = sorted(rng.randrange(len(trace)) for _ in range(8))
+    expected, want = {}, iter(targets)
+    t = next(want)
+    for step, frame in enumerate(trace.frames()):
+        while step == t:
+            expected[t] = list(frame[0]), frame[1], frame[2], list(frame[3])
+            t = next(want, -1)
+        if t < 0:
+            break
+    for t in targets:
+        assert timeline.frame_at(t) == expected[t], t
+
+    for label, steps in (("random", [rng.randrange(len(trace)) for _ in range(args.seeks)]),
+                         ("backward", [len(trace) - 1 - i * (len(trace) // args.seeks) for i in range(args.seeks)]),
+                         ("step +1", [len(trace) // 2 + i for i in range(args.seeks)])):
+        times = []
+        for s in steps:
+            t0 = time.perf_counter()
+            timeline.frame_at(s)
+            times.append((time.perf_counter() - t0) * 1e3)
+        times.sort()
+        print(f"{label:<10} p50 {statistics.median(times):7.2f}ms   p99 {times[int(len(times) * 0.99) - 1]:7.2f}ms   max {times[-1]:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
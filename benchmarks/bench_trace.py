@@ -0,0 +1,56 @@
+import argparse
+import random
+import sys
+import time
+
+from sorts import bubble_sort, insertion_sort, selection_sort, merge_sort, quick_sort
+from tracing import record
+
+QUADRATIC = {"Bubble Sort": bubble_sort, "Insertion Sort": insertion_sort, "Selection Sort": selection_sort}
+LOGLINEAR = {"Merge Sort": merge_sort, "Quick Sort": quick_sort}
+
+
+def snapshot_bytes(n, steps):
+    # what keeping history costs today: one list copy of the array per frame
+    return steps * (sys.getsizeof([0] * n))
+
+
+def bench(name, algorithm, n, verify):
+    arr = [random.randint(5, 100) for _ in range(n)]
+    t0 = time.perf_counter()
+    steps = sum(1 for _ in algorithm(list(arr)))
+    raw = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    trace = record(algorithm, arr)
+    rec = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in trace.frames():
+        pass
+    replay = time.perf_counter() - t0
+    if verify:
+        ref = ((list(a), list(h), list(p), list(s)) for a, h, p, s in algorithm(list(arr)))
+        assert all(f == (list(a), h, p, list(s)) for f, (a, h, p, s) in zip(ref, trace.frames())), name
+    print(f"{name:<15}{n:>8}{steps:>11}{raw:>9.3f}s{rec:>9.3f}s{steps / rec:>12,.0f}/s{replay:>9.3f}s"
+          f"{trace.nbytes / 2**20:>10.2f}MB{snapshot_bytes(n, steps) / 2**20:>13.1f}MB")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Trace recorder memory and throughput")
+    p.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    p.add_argument("--quadratic-max", type=int, default=1000)
+    p.add_argument("--verify", action="store_true", help="check replay against live frames")
+    args = p.parse_args()
+    print(f"{'algorithm':<15}{'n':>8}{'steps':>11}{'raw':>10}{'record':>10}{'rec rate':>14}{'replay':>10}{'trace':>12}{'snapshots':>15}")
+    for n in args.sizes:
+        algos = dict(LOGLINEAR)
+        if n <= args.quadratic_max:
+            algos.update(QUADRATIC)
+        for name, algorithm in algos.items():
+            try:
+                bench(name, algorithm, n, args.verify)
+            except RecursionError:
+                print(f"{name:<15}{n:>8}  hit the recursion limit")
+
+
+if __name__ == "__main__":
+    main()
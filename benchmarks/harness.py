@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+import random
+import time
+import tracemalloc
+
+from instrument import Stats, instrumented
+from sorts import SPECS, lookup
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few-unique", "organ-pipe", "all-equal")
+FIELDS = ("algorithm", "distribution", "n", "seconds", "frames", "comparisons", "writes", "swaps", "max_depth", "aux_peak", "phases", "peak_bytes", "error")
+
+
+def make_input(distribution, n, seed=0):
+    rng = random.Random(seed)
+    if distribution == "random":
+        return [rng.randint(1, max(100, n)) for _ in range(n)]
+    if distribution == "sorted":
+        return sorted(rng.randint(1, max(100, n)) for _ in range(n))
+    if distribution == "reversed":
+        return sorted((rng.randint(1, max(100, n)) for _ in range(n)), reverse=True)
+    if distribution == "few-unique":
+        return [rng.choice((10, 30, 50, 70, 90)) for _ in range(n)]
+    if distribution == "organ-pipe":
+        return list(range(1, n // 2 + 1)) + list(range(n - n // 2, 0, -1))
+    if distribution == "all-equal":
+        return [50] * n
+    raise ValueError(f"unknown distribution {distribution!r}")
+
+
+class _Budget(Exception):
+    pass
+
+
+def _drain(gen, max_frames):
+    frames = 0
+    for _ in gen:
+        frames += 1
+        if frames > max_frames:
+            raise _Budget
+    return frames
+
+
+def out_of_range(gen, n, max_frames):
+    # the first frame naming an index outside [0, n) as (frame, index), or None; every renderer indexes its
+    # per-bar state with these. A sorted list that only grows is checked one new tail at a time
+    seen, checked = None, 0
+    for k, (_, highlights, pivots, sorted_indices) in enumerate(gen):
+        if k >= max_frames:
+            raise _Budget
+        if sorted_indices is not seen or len(sorted_indices) < checked:
+            seen, checked = sorted_indices, 0
+        for group in (highlights, pivots, sorted_indices[checked:]):
+            for i in group:
+                if not 0 <= i < n:
+                    return k, i
+        checked = len(sorted_indices)
+    return None
+
+
+def measure(algorithm, arr, max_frames=5_000_000, memory=True, counts=True):
+    if isinstance(algorithm, str):
+        algorithm = lookup(algorithm)
+    row = dict.fromkeys(FIELDS[3:])
+    row["error"] = ""
+    try:
+        out = list(arr)
+        t0 = time.perf_counter()
+        row["frames"] = _drain(algorithm(out), max_frames)
+        row["seconds"] = time.perf_counter() - t0
+        if out != sorted(arr):
+            row["error"] = "not sorted"
+            return row
+        bad = out_of_range(algorithm(list(arr)), len(arr), max_frames)
+        if bad:
+            row["error"] = f"frame {bad[0]} names index {bad[1]}"
+            return row
+        if memory:
+            tracemalloc.start()
+            try:
+                _drain(algorithm(list(arr)), max_frames)
+                row["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        if counts:
+            stats = Stats()
+            _drain(instrumented(algorithm, list(arr), stats), max_frames)
+            stats = stats.as_dict()
+            del stats["frames"]
+            row.update(stats)
+    except _Budget:
+        row["error"] = f"over {max_frames} frames"
+    except RecursionError:
+        row["error"] = "recursion limit"
+    return row
+
+
+def run_suite(algorithms=None, distributions=DISTRIBUTIONS, sizes=(10, 100, 1000), seed=0, **kwargs):
+    rows = []
+    for name in algorithms or SPECS:
+        for distribution in distributions:
+            for n in sizes:
+                row = {"algorithm": name, "distribution": distribution, "n": n}
+                row.update(measure(name, make_input(distribution, n, seed), **kwargs))
+                rows.append(row)
+    return rows
+
+
+def check_regressions(rows, baseline, frame_ratio=1.5, time_ratio=1.8):
+    # compares against a previous run's rows; returns one message per metric that grew past its ratio
+    base = {(r["algorithm"], r["distribution"], r["n"]): r for r in baseline}
+    problems = []
+    for row in rows:
+        old = base.get((row["algorithm"], row["distribution"], row["n"]))
+        if not old:
+            continue
+        where = f'{row["algorithm"]} / {row["distribution"]} / n={row["n"]}'
+        if row["error"] and not old["error"]:
+            problems.append(f"{where}: {row['error']}")
+            continue
+        for field, ratio in (("frames", frame_ratio), ("seconds", time_ratio)):
+            if row[field] and old[field] and row[field] > old[field] * ratio:
+                problems.append(f"{where}: {field} {old[field]:.6g} -> {row[field]:.6g} (x{row[field] / old[field]:.2f})")
+    return problems
+
+
+def to_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(dict(row, phases=json.dumps(row["phases"])))
+    return out.getvalue()
+
+
+def to_json(rows):
+    return json.dumps(rows, indent=2)
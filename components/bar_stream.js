@@ -0,0 +1,36 @@
+// Streams BarStream payloads into a view that stays alive across reruns: a keyframe resets every bar,
+// later payloads only name the bars that differ from it. Binary keyframes go to the raster view.
+const STREAMS = (globalThis.__dsaBarStreams ||= new Map());
+
+export default function (component) {
+  const { data, parentElement } = component;
+  if (!data) return;
+  let s = STREAMS.get(data.id);
+  const binary = "vb" in data;
+  const keyframe = binary || "v" in data;
+  const View = binary ? RasterBars : DomBars;
+  if (keyframe && !(s && s.view instanceof View)) {
+    s = { view: new View(), key: -1 };
+    STREAMS.set(data.id, s);
+  }
+  if (!s) return;
+  const view = s.view;
+  attach(view.root, parentElement);
+  view.setMax(data.max);
+  if (keyframe) {
+    const vals = binary ? decode(data.vb, Int32Array) : data.v;
+    const states = binary ? decode(data.sb) : Array.from(data.s, (c) => c.charCodeAt(0) - 48);
+    // level-of-detail keyframes carry buckets: highest values in vb, lowest in lb
+    const lows = data.lb ? decode(data.lb, Int32Array) : vals;
+    s.key = data.k;
+    view.reset(vals.length);
+    for (let i = 0; i < vals.length; i++) view.set(i, vals[i], states[i], lows[i]);
+  } else if (data.k === s.key && data.q) {
+    const q = data.q;
+    for (let j = 0; j < q.length; j += 4) view.set(q[j], q[j + 2], q[j + 3], q[j + 1]);
+  } else if (data.k === s.key) {
+    const d = data.d;
+    for (let j = 0; j < d.length; j += 3) view.set(d[j], d[j + 1], d[j + 2]);
+  } // else: missed the keyframe; the next one resyncs the view
+  view.flush();
+}
@@ -0,0 +1,229 @@
+// Bar views shared by the streaming and playback components. Both keep the last painted value and
+// state per bar, so set() on an unchanged bar costs nothing and flush() only touches what changed.
+const HEIGHT = 500;
+const LITTLE = new Uint8Array(new Uint32Array([1]).buffer)[0] === 1;
+const rgba = (r, g, b) => (LITTLE ? (255 << 24) | (b << 16) | (g << 8) | r : (r << 24) | (g << 16) | (b << 8) | 255) >>> 0;
+const BACKGROUND = rgba(17, 24, 39);
+const RGB = [[14, 165, 233], [236, 72, 153], [234, 179, 8], [16, 185, 129]];
+const COLORS = RGB.map(([r, g, b]) => rgba(r, g, b));
+// the same colours at 40% over the background, for the part of a bucket above its lowest bar
+const FADED = RGB.map(([r, g, b]) => rgba(((r * 2 + 17 * 3) / 5) | 0, ((g * 2 + 24 * 3) / 5) | 0, ((b * 2 + 39 * 3) / 5) | 0));
+// past this many bars a value label gets under ~17px of a 1100px row (render.LABEL_MAX_BARS)
+const LABEL_MAX = 64;
+const percent = (v, max) => Math.max(5, Math.floor((v / max) * 100));
+const fontSize = (n) => (n <= 20 ? "14px" : n <= 35 ? "12px" : n <= 50 ? "10px" : "8px");
+
+function decode(b64, Type = Uint8Array) {
+  const raw = atob(b64);
+  const bytes = new Uint8Array(raw.length);
+  for (let i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+  return new Type(bytes.buffer);
+}
+
+function attach(root, parentElement) {
+  if (root.parentNode !== parentElement) parentElement.appendChild(root);
+}
+
+class DomBars {
+  constructor() {
+    this.root = document.createElement("div");
+    this.row = document.createElement("div");
+    this.root.className = "frame";
+    this.row.className = "row";
+    this.root.appendChild(this.row);
+    this.bars = [];
+    this.labels = [];
+    this.vals = [];
+    this.states = [];
+    this.max = 1;
+  }
+
+  reset(n) {
+    while (this.bars.length < n) {
+      const bar = document.createElement("div");
+      const label = document.createElement("span");
+      bar.appendChild(label);
+      this.row.appendChild(bar);
+      this.bars.push(bar);
+      this.labels.push(label);
+      this.vals.push(null);
+      this.states.push(-1);
+    }
+    while (this.bars.length > n) {
+      this.row.removeChild(this.bars.pop());
+      this.labels.pop();
+      this.vals.pop();
+      this.states.pop();
+    }
+    this.row.style.fontSize = fontSize(n);
+    this.row.classList.toggle("bare", n > LABEL_MAX);
+  }
+
+  setMax(max) {
+    if (max === this.max) return;
+    this.max = max || 1;
+    for (let i = 0; i < this.bars.length; i++) this.bars[i].style.height = percent(this.vals[i], this.max) + "%";
+  }
+
+  set(i, v, st) {
+    if (this.vals[i] !== v) {
+      this.vals[i] = v;
+      this.bars[i].style.height = percent(v, this.max) + "%";
+      this.labels[i].textContent = v;
+    }
+    if (this.states[i] !== st) {
+      this.states[i] = st;
+      this.bars[i].className = "bar s" + st;
+    }
+  }
+
+  flush() {}
+}
+
+// Raster view for large arrays. Bars are grouped into buckets, one per pixel column once there are more bars
+// than columns; a bucket keeps its highest and lowest value and a count per state, so set() updates it in
+// O(1) and paint() redraws only the buckets that changed. A bucket whose highest or lowest bar was
+// overwritten is rescanned once, when it is painted. Each bucket draws solid up to its lowest value and
+// faded up to its highest, in its most important state: comparing > pivot > sorted > unsorted.
+class RasterBars {
+  constructor() {
+    this.root = document.createElement("div");
+    this.canvas = document.createElement("canvas");
+    this.root.className = "frame";
+    this.root.appendChild(this.canvas);
+    this.ctx = this.canvas.getContext("2d");
+    this.max = 1;
+    this.queued = false;
+    this.reset(0);
+  }
+
+  reset(n) {
+    this.n = n;
+    this.vals = new Int32Array(n);
+    this.lows = new Int32Array(n);
+    this.states = new Uint8Array(n);
+    this.buckets = 0;
+  }
+
+  rebucket(count) {
+    const { n, vals, lows, states } = this;
+    this.buckets = count;
+    this.start = new Int32Array(count + 1);
+    this.of = new Int32Array(n);
+    this.hi = new Int32Array(count);
+    this.lo = new Int32Array(count);
+    this.counts = new Uint32Array(count * 4);
+    this.stale = new Uint8Array(count);
+    this.dirty = new Uint8Array(count).fill(1);
+    this.pending = Array.from({ length: count }, (_, b) => b);
+    for (let b = 0; b <= count; b++) this.start[b] = Math.floor((b * n) / count);
+    for (let b = 0; b < count; b++) {
+      let hi = -Infinity, lo = Infinity;
+      for (let i = this.start[b]; i < this.start[b + 1]; i++) {
+        this.of[i] = b;
+        this.counts[b * 4 + states[i]]++;
+        if (vals[i] > hi) hi = vals[i];
+        if (lows[i] < lo) lo = lows[i];
+      }
+      this.hi[b] = hi;
+      this.lo[b] = lo;
+    }
+  }
+
+  touch(b) {
+    if (this.dirty[b]) return;
+    this.dirty[b] = 1;
+    this.pending.push(b);
+  }
+
+  setMax(max) {
+    if (max === this.max) return;
+    this.max = max || 1;
+    for (let b = 0; b < this.buckets; b++) this.touch(b);
+  }
+
+  set(i, v, st, low = v) {
+    const { vals, lows, states } = this;
+    if (vals[i] === v && lows[i] === low && states[i] === st) return;
+    if (!this.buckets) {
+      vals[i] = v;
+      lows[i] = low;
+      states[i] = st;
+      return;
+    }
+    const b = this.of[i];
+    if (states[i] !== st) {
+      this.counts[b * 4 + states[i]]--;
+      this.counts[b * 4 + st]++;
+      states[i] = st;
+    }
+    if (vals[i] !== v) {
+      if (v >= this.hi[b]) this.hi[b] = v;
+      else if (vals[i] === this.hi[b]) this.stale[b] = 1;
+      vals[i] = v;
+    }
+    if (lows[i] !== low) {
+      if (low <= this.lo[b]) this.lo[b] = low;
+      else if (lows[i] === this.lo[b]) this.stale[b] = 1;
+      lows[i] = low;
+    }
+    this.touch(b);
+  }
+
+  flush() {
+    if (this.queued || (this.buckets && !this.pending.length)) return;
+    this.queued = true;
+    requestAnimationFrame(() => this.paint());
+  }
+
+  resize() {
+    const dpr = window.devicePixelRatio || 1;
+    const width = Math.max(1, Math.floor(this.canvas.clientWidth * dpr) || 1000);
+    const height = Math.max(1, Math.floor(this.canvas.clientHeight * dpr) || HEIGHT);
+    if (!this.image || this.image.width !== width || this.image.height !== height) {
+      this.canvas.width = width;
+      this.canvas.height = height;
+      this.image = this.ctx.createImageData(width, height);
+      this.pixels = new Uint32Array(this.image.data.buffer);
+      this.buckets = 0;
+    }
+    if (!this.buckets && this.n) this.rebucket(Math.min(this.n, width));
+  }
+
+  rescan(b) {
+    let hi = -Infinity, lo = Infinity;
+    for (let i = this.start[b]; i < this.start[b + 1]; i++) {
+      if (this.vals[i] > hi) hi = this.vals[i];
+      if (this.lows[i] < lo) lo = this.lows[i];
+    }
+    this.hi[b] = hi;
+    this.lo[b] = lo;
+    this.stale[b] = 0;
+  }
+
+  paint() {
+    this.queued = false;
+    this.resize();
+    const { buckets, counts, pixels } = this;
+    if (!buckets) return;
+    const W = this.image.width, H = this.image.height;
+    const gap = W / buckets >= 4;
+    let x0 = W, x1 = 0;
+    for (const b of this.pending) {
+      this.dirty[b] = 0;
+      if (this.stale[b]) this.rescan(b);
+      const st = counts[b * 4 + 1] ? 1 : counts[b * 4 + 2] ? 2 : counts[b * 4 + 3] ? 3 : 0;
+      const top = H - Math.round((percent(this.hi[b], this.max) / 100) * H);
+      const mid = Math.max(top, H - Math.round((percent(this.lo[b], this.max) / 100) * H));
+      const from = Math.floor((b * W) / buckets), to = Math.floor(((b + 1) * W) / buckets);
+      for (let x = from; x < to; x++) {
+        const edge = gap && x === to - 1;
+        for (let y = 0; y < H; y++) pixels[y * W + x] = edge || y < top ? BACKGROUND : y < mid ? FADED[st] : COLORS[st];
+      }
+      if (from < x0) x0 = from;
+      if (to > x1) x1 = to;
+    }
+    this.pending = [];
+    if (x1 > x0) this.ctx.putImageData(this.image, 0, 0, x0, 0, x1 - x0, H);
+  }
+}
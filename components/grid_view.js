@@ -0,0 +1,52 @@
+// Grid view for pathfinding traces: one canvas pixel per cell, scaled up without smoothing. Like the bar
+// views it keeps the colour last painted per cell, so set() on an unchanged cell costs nothing and flush()
+// puts back only the rectangle around the cells that changed.
+const CELL_RGB = [[31, 41, 55], [107, 114, 128], [14, 165, 233], [7, 89, 133]];
+const CELL_COLORS = CELL_RGB.map(([r, g, b]) => rgba(r, g, b));
+// a step's own states win over the cell's: comparing, expanding (the pivot) and the path found (sorted)
+const STEP_COLORS = [null, rgba(236, 72, 153), rgba(234, 179, 8), rgba(16, 185, 129)];
+
+class GridView {
+  constructor(cols) {
+    this.cols = cols;
+    this.root = document.createElement("div");
+    this.root.className = "frame";
+    this.canvas = document.createElement("canvas");
+    this.canvas.className = "grid";
+    this.root.appendChild(this.canvas);
+    this.ctx = this.canvas.getContext("2d");
+  }
+
+  reset(n) {
+    const rows = Math.ceil(n / this.cols);
+    this.canvas.width = this.cols;
+    this.canvas.height = rows;
+    this.image = this.ctx.createImageData(this.cols, rows);
+    this.pixels = new Uint32Array(this.image.data.buffer);
+    this.pixels.fill(CELL_COLORS[0]);
+    this.x0 = this.y0 = 0;
+    this.x1 = this.cols - 1;
+    this.y1 = rows - 1;
+  }
+
+  // cell codes are not heights
+  setMax() {}
+
+  set(i, v, st) {
+    const c = st ? STEP_COLORS[st] : CELL_COLORS[v] ?? CELL_COLORS[0];
+    if (this.pixels[i] === c) return;
+    this.pixels[i] = c;
+    const x = i % this.cols, y = (i / this.cols) | 0;
+    if (x < this.x0) this.x0 = x;
+    if (x > this.x1) this.x1 = x;
+    if (y < this.y0) this.y0 = y;
+    if (y > this.y1) this.y1 = y;
+  }
+
+  flush() {
+    if (this.x1 < this.x0) return;
+    this.ctx.putImageData(this.image, 0, 0, this.x0, this.y0, this.x1 - this.x0 + 1, this.y1 - this.y0 + 1);
+    this.x0 = this.y0 = Infinity;
+    this.x1 = this.y1 = -1;
+  }
+}
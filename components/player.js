@@ -0,0 +1,86 @@
+// Plays a recorded Trace entirely in the browser. The columns arrive once; play, pause, seek, step and
+// speed changes never go back to Python. Shared by the trace_player component and the static index.html.
+const SPEEDS = [0.25, 0.5, 1, 2, 4, 8, 16, 64];
+
+class Player {
+  constructor(data) {
+    this.root = document.createElement("div");
+    this.view = data.grid ? new GridView(data.grid) : data.raster ? new RasterBars() : new DomBars();
+    this.root.appendChild(this.view.root);
+    this.root.insertAdjacentHTML(
+      "beforeend",
+      '<div class="controls"><button data-act="back">&#9664;&#9664;</button><button data-act="play">Play</button>' +
+        '<button data-act="next">&#9654;&#9654;</button><input type="range" min="0" value="0">' +
+        "<span></span><select>" + SPEEDS.map((x) => `<option value="${x}"${x === 1 ? " selected" : ""}>${x}x</option>`).join("") + "</select></div>"
+    );
+    this.slider = this.root.querySelector("input");
+    this.label = this.root.querySelector("span");
+    this.playButton = this.root.querySelector('[data-act="play"]');
+    this.root.querySelector('[data-act="back"]').onclick = () => {
+      this.pause();
+      this.seek(this.tl.pos - 1);
+    };
+    this.root.querySelector('[data-act="next"]').onclick = () => {
+      this.pause();
+      this.advance(1);
+    };
+    this.slider.oninput = () => {
+      this.pause();
+      this.seek(+this.slider.value);
+    };
+    this.playButton.onclick = () => (this.playing ? this.pause() : this.play());
+    this.root.querySelector("select").onchange = (e) => (this.rate = this.fps * +e.target.value);
+    this.load(data);
+  }
+
+  load(data) {
+    this.trace = data.trace;
+    this.tl = new Timeline(data, this.view);
+    this.fps = this.rate = data.fps;
+    this.slider.max = Math.max(0, this.tl.steps - 1);
+    this.pause();
+    this.seek(data.autoplay ? 0 : this.tl.steps - 1);
+    if (data.autoplay) this.play();
+  }
+
+  sync() {
+    this.slider.value = this.tl.pos;
+    this.label.textContent = `${this.tl.pos + 1} / ${this.tl.steps}`;
+  }
+
+  advance(k) {
+    if (this.tl.pos + 1 >= this.tl.steps) return this.pause();
+    this.tl.advanceTo(this.tl.pos + k);
+    this.sync();
+  }
+
+  seek(t) {
+    this.tl.seek(t);
+    this.sync();
+  }
+
+  play() {
+    if (this.tl.pos + 1 >= this.tl.steps) this.seek(0);
+    this.playing = true;
+    this.playButton.textContent = "Pause";
+    const run = (this.run = (this.run || 0) + 1);
+    let last = performance.now(), owed = 0;
+    const tick = (now) => {
+      if (!this.playing || this.run !== run) return;
+      owed += ((now - last) / 1000) * this.rate;
+      last = now;
+      if (owed >= 1) {
+        // however many steps are due go into a single repaint
+        this.advance(Math.floor(owed));
+        owed -= Math.floor(owed);
+      }
+      requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+  }
+
+  pause() {
+    this.playing = false;
+    this.playButton.textContent = "Play";
+  }
+}
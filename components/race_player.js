@@ -0,0 +1,118 @@
+// Plays several recorded Traces side by side against one clock. In "steps" mode the clock counts
+// logical steps, so every lane takes the same number per frame; in "clock" mode it counts compute
+// seconds, and each lane moves at the speed its generator actually ran. Each frame every lane
+// repaints once, however many steps it moved.
+const RACES = (globalThis.__dsaRaces ||= new Map());
+
+class Race {
+  constructor(data) {
+    this.race = data.race;
+    this.root = document.createElement("div");
+    this.grid = document.createElement("div");
+    this.grid.className = "lanes";
+    this.root.appendChild(this.grid);
+    const budget = (64 << 20) / data.lanes.length;
+    this.lanes = data.lanes.map((lane) => {
+      const box = document.createElement("div");
+      box.className = "lane";
+      box.innerHTML = '<div class="lane-head"><b></b><span></span></div>';
+      box.querySelector("b").textContent = lane.name;
+      const view = data.raster ? new RasterBars() : new DomBars();
+      box.appendChild(view.root);
+      this.grid.appendChild(box);
+      return { name: lane.name, seconds: lane.seconds, tl: new Timeline(lane.trace, view, budget), label: box.querySelector("span") };
+    });
+    this.root.insertAdjacentHTML(
+      "beforeend",
+      '<div class="controls"><button data-act="restart">&#9664;&#9664;</button><button data-act="play">Play</button>' +
+        '<input type="range" min="0" max="1000" value="0"><span></span></div>'
+    );
+    this.slider = this.root.querySelector("input");
+    this.label = this.root.querySelector(".controls span");
+    this.playButton = this.root.querySelector('[data-act="play"]');
+    this.root.querySelector('[data-act="restart"]').onclick = () => {
+      this.pause();
+      this.goto(0);
+    };
+    this.slider.oninput = () => {
+      this.pause();
+      this.goto((+this.slider.value / 1000) * this.length);
+    };
+    this.playButton.onclick = () => (this.playing ? this.pause() : this.play());
+    this.t = 0;
+    this.setRate(data);
+    this.goto(0);
+    this.play();
+  }
+
+  setRate(data) {
+    // switching between steps and wall-clock keeps the race at the same fraction of its length
+    const progress = this.length ? this.t / this.length : 0;
+    this.mode = data.mode;
+    this.fps = data.fps;
+    this.duration = data.duration;
+    // clock units: steps, or seconds of compute; rate is units per second of playback
+    this.length = Math.max(...this.lanes.map((l) => (this.mode === "clock" ? l.seconds : l.tl.steps)));
+    this.rate = this.mode === "clock" ? this.length / data.duration : data.fps;
+    this.t = progress * this.length;
+  }
+
+  stepAt(lane, t) {
+    const steps = lane.tl.steps;
+    if (this.mode === "clock") return lane.seconds > 0 ? Math.floor((t / lane.seconds) * steps) : steps;
+    return Math.floor(t);
+  }
+
+  goto(t) {
+    this.t = Math.max(0, Math.min(this.length, t));
+    let done = 0;
+    for (const lane of this.lanes) {
+      const step = Math.min(lane.tl.steps - 1, this.stepAt(lane, this.t));
+      lane.tl.advanceTo(step);
+      const finished = lane.tl.pos >= lane.tl.steps - 1;
+      if (finished) done++;
+      lane.label.textContent = finished ? "finished" : `${lane.tl.pos + 1} / ${lane.tl.steps}`;
+    }
+    this.slider.value = Math.round((this.t / (this.length || 1)) * 1000);
+    this.label.textContent = this.mode === "clock" ? `${(this.t * 1e3).toFixed(2)} ms of compute` : `step ${Math.floor(this.t)}`;
+    return done === this.lanes.length;
+  }
+
+  play() {
+    if (this.t >= this.length) this.goto(0);
+    this.playing = true;
+    this.playButton.textContent = "Pause";
+    const run = (this.run = (this.run || 0) + 1);
+    let last = performance.now();
+    const tick = (now) => {
+      if (!this.playing || this.run !== run) return;
+      const dt = (now - last) / 1000;
+      last = now;
+      if (this.goto(this.t + dt * this.rate)) return this.pause();
+      requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+  }
+
+  pause() {
+    this.playing = false;
+    this.playButton.textContent = "Play";
+  }
+}
+
+export default function (component) {
+  const { data, parentElement } = component;
+  if (!data) return;
+  let race = RACES.get(data.id);
+  if (!race || race.race !== data.race) {
+    if (race) {
+      race.pause();
+      race.root.remove();
+    }
+    RACES.set(data.id, (race = new Race(data)));
+  } else if (race.mode !== data.mode || race.fps !== data.fps || race.duration !== data.duration) {
+    race.setRate(data);
+    race.goto(race.t);
+  }
+  attach(race.root, parentElement);
+}
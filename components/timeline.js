@@ -0,0 +1,94 @@
+// Replays a recorded Trace's event columns into a bar view. Snapshots every K steps keep a seek to O(K)
+// replayed steps; moving forward applies only the steps in between and repaints the bars they touched.
+const COMPARE = 0, RANGE = 1, PIVOT = 2, SWAP = 3, WRITE = 4, SORTED = 5, CLEAR = 6;
+const SNAPSHOT_BYTES = 64 << 20;
+
+class Timeline {
+  constructor(data, view, snapshotBytes = SNAPSHOT_BYTES) {
+    this.view = view;
+    this.n = data.n;
+    this.steps = data.steps;
+    this.ops = decode(data.ops);
+    this.a = decode(data.a, Int32Array);
+    this.b = decode(data.b, Int32Array);
+    this.offsets = decode(data.offsets, Uint32Array);
+    this.vals = decode(data.initial, Int32Array);
+    this.sorted = new Uint8Array(this.n);
+    this.marks = [];
+    this.pos = -1;
+    view.reset(this.n);
+    // values only ever come from the initial array or a WRITE, so one scan fixes the scale for every step
+    this.max = 1;
+    for (const v of this.vals) if (v > this.max) this.max = v;
+    for (let e = 0; e < this.ops.length; e++) if (this.ops[e] === WRITE && this.b[e] > this.max) this.max = this.b[e];
+    this.K = Math.max(64, Math.ceil(Math.sqrt(this.steps)), Math.ceil((this.steps * this.n * 5) / snapshotBytes));
+    this.snapshots = [];
+    for (let t = 0; t < this.steps; t++) {
+      if (t % this.K === 0) this.snapshots.push([this.vals.slice(), this.sorted.slice()]);
+      this.apply(t, null);
+    }
+  }
+
+  // applies step t's state events; view events (and every touched bar) are collected into marks
+  apply(t, marks) {
+    const { ops, a, b, vals, sorted } = this;
+    for (let e = this.offsets[t]; e < this.offsets[t + 1]; e++) {
+      const op = ops[e], x = a[e], y = b[e];
+      if (op === SWAP) {
+        const tmp = vals[x];
+        vals[x] = vals[y];
+        vals[y] = tmp;
+        if (marks) marks.touched.push(x, y);
+      } else if (op === WRITE) {
+        vals[x] = y;
+        if (marks) marks.touched.push(x);
+      } else if (op === SORTED) {
+        sorted[x] = 1;
+        if (marks) marks.touched.push(x);
+      } else if (op === CLEAR) {
+        sorted.fill(0);
+        if (marks) marks.all = true;
+      } else if (marks) {
+        if (op === COMPARE) marks.hl.push(x), y >= 0 && marks.hl.push(y);
+        else if (op === RANGE) for (let i = x; i < y; i++) marks.hl.push(i);
+        else if (op === PIVOT) marks.pv.push(x);
+      }
+    }
+  }
+
+  draw(marks, full) {
+    const { view, vals, sorted } = this;
+    const hl = new Set(marks.hl), pv = new Set(marks.pv);
+    const state = (i) => (sorted[i] ? 3 : hl.has(i) ? 1 : pv.has(i) ? 2 : 0);
+    view.setMax(this.max);
+    if (full || marks.all) {
+      for (let i = 0; i < this.n; i++) view.set(i, vals[i], state(i));
+    } else {
+      for (const list of [this.marks, marks.hl, marks.pv, marks.touched]) for (const i of list) view.set(i, vals[i], state(i));
+    }
+    view.flush();
+    this.marks = marks.hl.concat(marks.pv);
+  }
+
+  seek(t) {
+    t = Math.max(0, Math.min(this.steps - 1, t));
+    const c = Math.floor(t / this.K);
+    this.vals.set(this.snapshots[c][0]);
+    this.sorted.set(this.snapshots[c][1]);
+    for (let s = c * this.K; s < t; s++) this.apply(s, null);
+    const marks = { hl: [], pv: [], touched: [], all: false };
+    this.apply(t, marks);
+    this.pos = t;
+    this.draw(marks, true);
+  }
+
+  // forward moves replay the steps in between (their highlights merged into one paint); anything else seeks
+  advanceTo(t) {
+    t = Math.max(0, Math.min(this.steps - 1, t));
+    if (t === this.pos) return;
+    if (this.pos < 0 || t < this.pos || t - this.pos > this.K) return this.seek(t);
+    const marks = { hl: [], pv: [], touched: [], all: false };
+    while (this.pos < t) this.apply(++this.pos, marks);
+    this.draw(marks, false);
+  }
+}
@@ -0,0 +1,19 @@
+// Streamlit wrapper around Player: one per id, kept alive across reruns, replaced when the trace changes.
+const PLAYERS = (globalThis.__dsaPlayers ||= new Map());
+
+export default function (component) {
+  const { data, parentElement } = component;
+  if (!data) return;
+  let player = PLAYERS.get(data.id);
+  if (!player || player.trace !== data.trace) {
+    if (player) {
+      player.pause();
+      player.root.remove();
+    }
+    PLAYERS.set(data.id, (player = new Player(data)));
+  } else if (player.fps !== data.fps) {
+    player.rate *= data.fps / player.fps;
+    player.fps = data.fps;
+  }
+  attach(player.root, parentElement);
+}
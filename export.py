@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+from fastpath import DISTRIBUTIONS, generate
+from render import THEME, bar_states
+from scheduler import count_steps
+from sorts import ALGORITHMS, lookup
+from tracing import record, stream
+
+# Headless export: frames come straight off the generator, are rasterized to palette-indexed pixels with
+# numpy and encoded in worker processes, and are written out in order as they come back. Only a fixed
+# window of batches is ever in flight, so memory does not grow with the length of the sort.
+
+BACKGROUND = "#111827"
+PALETTE = np.array([[int(c[i:i + 2], 16) for i in (1, 3, 5)] for c in (BACKGROUND, *(t["bg"] for t in THEME.values()))], np.uint8)
+BATCH = 32
+
+
+def rasterize(values, states, width, height):
+    # one palette index per pixel: 0 is the background, 1 + state for a bar
+    n = len(values)
+    img = np.zeros((height, width), np.uint8)
+    if n == 0:
+        return img
+    values = np.asarray(values, np.int64)
+    top = max(int(values.max()), 1)
+    h = np.clip(values * (height - 4) // top, 1, height).astype(np.int32)
+    h[values <= 0] = 0
+    col = np.arange(width) * n // width
+    color = (np.frombuffer(states, np.uint8) + 1)[col]
+    if width >= 3 * n:
+        color[np.diff(col, append=n) != 0] = 0
+    rows = np.arange(height, 0, -1, dtype=np.int32)[:, None]
+    np.copyto(img, color[None, :], where=rows <= h[col][None, :])
+    return img
+
+
+def _image(index):
+    im = Image.frombytes("P", index.shape[::-1], index.tobytes())
+    im.putpalette(PALETTE.tobytes())
+    return im
+
+
+def _encode(batch, width, height, kind, duration):
+    # worker side: a batch of (values, states) to encoded frames
+    out = []
+    for values, states in batch:
+        index = rasterize(values, states, width, height)
+        if kind == "gif":
+            out.append(b"".join(GifImagePlugin.getdata(_image(index), duration=duration, disposal=1)))
+        else:
+            out.append(PALETTE[index].tobytes())
+    return out
+
+
+def sampled(algorithm, arr, every=1, log=None):
+    # every `every`-th frame as (values, states), plus the last; each step's events go to log as JSON lines
+    if log is not None:
+        log.write(json.dumps({"n": len(arr), "initial": list(arr)}) + "\n")
+    last = None
+    for step, (frame, events) in enumerate(stream(algorithm, arr)):
+        if log is not None:
+            log.write(json.dumps({"step": step, "events": events}) + "\n")
+        last = None if step % every == 0 else frame
+        if last is None:
+            yield np.array(frame[0], np.int64), bytes(bar_states(len(frame[0]), *frame[1:]))
+    if last is not None:
+        yield np.array(last[0], np.int64), bytes(bar_states(len(last[0]), *last[1:]))
+
+
+class _Sink:
+    def __init__(self, path, width, height, fps):
+        self.kind = "gif" if path.endswith(".gif") else "video"
+        if self.kind == "gif":
+            self.out = open(path, "wb")
+            header, _ = GifImagePlugin.getheader(_image(np.zeros((height, width), np.uint8)), None, {"loop": 0})
+            self.out.write(b"".join(header))
+            return
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError(f"writing {path} needs ffmpeg on PATH; .gif and .jsonl export work without it")
+        self.proc = subprocess.Popen([ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                                      "-s", f"{width}x{height}", "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", path],
+                                     stdin=subprocess.PIPE)
+        self.out = self.proc.stdin
+
+    def write(self, frame):
+        self.out.write(frame)
+
+    def close(self):
+        if self.kind == "gif":
+            self.out.write(b";")
+            self.out.close()
+            return
+        self.out.close()
+        if self.proc.wait():
+            raise RuntimeError(f"ffmpeg exited with status {self.proc.returncode}")
+
+
+def export(spec, arr, path=None, events=None, fps=30, every=1, size=(960, 540), pool=None):
+    # streams spec run on arr to a GIF or video at path and/or a JSONL event log at events; returns frames written
+    width, height = size[0] // 2 * 2, size[1] // 2 * 2
+    algorithm = lookup(spec)
+    log = open(events, "w") if events else None
+    sink = _Sink(path, width, height, fps) if path else None
+    own = pool is None and sink is not None
+    if own:
+        pool = ProcessPoolExecutor(os.cpu_count() or 1)
+    written, pending, batch = 0, deque(), []
+    window = 2 * (os.cpu_count() or 1)
+
+    def drain(limit):
+        nonlocal written
+        while len(pending) > limit:
+            for frame in pending.popleft().result():
+                sink.write(frame)
+                written += 1
+
+    try:
+        for frame in sampled(algorithm, arr, every, log):
+            if sink is None:
+                written += 1
+                continue
+            batch.append(frame)
+            if len(batch) == BATCH:
+                pending.append(pool.submit(_encode, batch, width, height, sink.kind, round(1000 / fps)))
+                batch = []
+                drain(window)
+        if batch:
+            pending.append(pool.submit(_encode, batch, width, height, sink.kind, round(1000 / fps)))
+        if sink is not None:
+            drain(0)
+    finally:
+        if log is not None:
+            log.close()
+        if sink is not None:
+            sink.close()
+        if own:
+            pool.shutdown()
+    return written
+
+
+def write_trace(spec, arr, path, **meta):
+    # the recorded trace as JSON, in the payload shape the browser players read; returns its manifest entry
+    trace = record(lookup(spec), arr)
+    with open(path, "w") as f:
+        json.dump(dict(trace.to_payload(), spec=spec, **meta), f, separators=(",", ":"))
+    return dict({"spec": spec, "file": os.path.basename(path), "n": len(arr), "steps": len(trace)}, **meta)
+
+
+def update_manifest(directory, entries):
+    # index.json lists every trace in directory for index.html; entries replace any with the same file
+    path = os.path.join(directory, "index.json")
+    old = []
+    if os.path.exists(path):
+        with open(path) as f:
+            old = json.load(f)
+    files = {e["file"] for e in entries}
+    merged = sorted([e for e in old if e["file"] not in files] + entries, key=lambda e: (e["n"], e["spec"]))
+    with open(path, "w") as f:
+        json.dump(merged, f, indent=1)
+
+
+def _slug(spec):
+    return re.sub(r"[^a-z0-9]+", "-", spec.lower()).strip("-")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m export", description="Render sorts to GIF/video, JSONL event logs or trace files without a browser")
+    p.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), metavar="NAME", help='"Name" or "Name:Variant" (default: every algorithm)')
+    p.add_argument("--size", type=int, default=40)
+    p.add_argument("--distribution", choices=DISTRIBUTIONS, default="Uniform")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--format", choices=("gif", "mp4", "webm", "trace", "none"), default="gif",
+                   help="trace writes JSON traces plus index.json for index.html (e.g. --out traces); none writes only the event logs")
+    p.add_argument("--events", action="store_true", help="also write a .jsonl event log per clip")
+    p.add_argument("--out", default="clips")
+    p.add_argument("--fps", type=int, default=30)
+    p.add_argument("--every", type=int, help="keep every Nth frame (default: fit the clip into --seconds)")
+    p.add_argument("--seconds", type=float, default=20)
+    p.add_argument("--width", type=int, default=960)
+    p.add_argument("--height", type=int, default=540)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = p.parse_args(argv)
+    for spec in args.algorithms:
+        try:
+            lookup(spec)
+        except ValueError as e:
+            p.error(str(e))
+
+    arr = generate(args.distribution, args.size, rng=np.random.default_rng(args.seed)).tolist()
+    os.makedirs(args.out, exist_ok=True)
+    if args.format == "trace":
+        entries = []
+        for spec in args.algorithms:
+            path = os.path.join(args.out, f"{_slug(spec)}-{args.size}.json")
+            entries.append(write_trace(spec, arr, path, distribution=args.distribution, seed=args.seed))
+            print(f"{spec}: {entries[-1]['steps']} steps -> {path}")
+        update_manifest(args.out, entries)
+        return
+    with ProcessPoolExecutor(args.workers) as pool:
+        for spec in args.algorithms:
+            every = args.every or max(1, ceil(count_steps(lookup(spec), arr) / (args.fps * args.seconds)))
+            base = os.path.join(args.out, _slug(spec))
+            path = None if args.format == "none" else f"{base}.{args.format}"
+            frames = export(spec, arr, path, f"{base}.jsonl" if args.events or path is None else None,
+                            args.fps, every, (args.width, args.height), pool)
+            print(f"{spec}: {frames} frames (every {every}) -> {path or base + '.jsonl'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import time
+
+import numpy as np
+
+# Bulk work on whole arrays with no frames: generating inputs, and "skip to result" runs that only need
+# the final state and a few measures of disorder. Everything here is one vectorized call or one pass per
+# level/digit, so 10^6 elements take milliseconds instead of the minutes the generators would.
+
+DISTRIBUTIONS = ("Uniform", "Gaussian", "Nearly sorted", "Few unique")
+
+# numpy kinds standing in for the comparison sorts; counting and radix sort are done digit by digit below
+NUMPY_KINDS = {"Merge Sort": "stable", "Tim Sort": "stable", "Insertion Sort": "stable", "Bubble Sort": "stable",
+               "Quick Sort": "quicksort", "Heap Sort": "heapsort", "Selection Sort": "quicksort", "Shell Sort": "quicksort"}
+
+
+def generate(distribution, n, low=5, high=100, swaps=None, rng=None):
+    rng = rng if rng is not None else np.random.default_rng()
+    if distribution == "Uniform":
+        return rng.integers(low, high + 1, n, dtype=np.int32)
+    if distribution == "Gaussian":
+        values = rng.normal((low + high) / 2, (high - low) / 6, n)
+        return np.clip(np.rint(values), low, high).astype(np.int32)
+    if distribution == "Nearly sorted":
+        a = np.sort(rng.integers(low, high + 1, n, dtype=np.int32))
+        k = max(1, n // 20) if swaps is None else swaps
+        if n > 1:
+            i, j = rng.integers(0, n, k), rng.integers(0, n, k)
+            a[i], a[j] = a[j], a[i]
+        return a
+    if distribution == "Few unique":
+        return rng.choice(rng.integers(low, high + 1, 5, dtype=np.int32), n)
+    raise ValueError(f"unknown distribution {distribution!r}")
+
+
+def runs(a):
+    # maximal non-decreasing runs
+    a = np.asarray(a)
+    return int(np.count_nonzero(a[1:] < a[:-1])) + 1 if a.size else 0
+
+
+def inversions(a):
+    # pairs i < j with a[i] > a[j]. Keys are partitioned on one bit at a time from the top, stably, the way
+    # an MSD radix sort would; a pair is counted at the highest bit where its keys differ, as a 1 that sits
+    # before a 0 inside the same group. Each bit is a handful of whole-array passes.
+    a = np.asarray(a)
+    n = a.size
+    if n < 2:
+        return 0
+    lo = int(a.min())
+    if int(a.max()) - lo < 2 * n:
+        keys = (a - lo).astype(np.int32)
+    else:
+        keys = np.searchsorted(np.unique(a), a).astype(np.int32)
+    span = int(keys.max()) + 1
+    below = np.zeros(span + 1, np.int32)
+    np.cumsum(np.bincount(keys, minlength=span), out=below[1:])
+    idx = np.arange(n, dtype=np.int32)
+    total = 0
+    for b in range((span - 1).bit_length() - 1, -1, -1):
+        bit = (keys >> b) & 1
+        first = (keys >> (b + 1)) << (b + 1)
+        ones = np.cumsum(bit, dtype=np.int32)
+        ones -= bit
+        ones -= ones[below[first]]
+        zero = bit == 0
+        total += int(ones.sum(where=zero, dtype=np.int64))
+        pos = idx - ones
+        np.add(below[np.minimum(first + (1 << b), span)], ones, out=pos, where=~zero)
+        nxt = np.empty_like(keys)
+        nxt[pos] = keys
+        keys = nxt
+    return total
+
+
+def counting_sort(a):
+    lo = int(a.min())
+    counts = np.bincount(a - lo)
+    return np.repeat(np.arange(lo, lo + counts.size, dtype=a.dtype), counts)
+
+
+def radix_sort(a):
+    # byte digits, so each pass is numpy's own stable counting sort on uint8
+    lo = int(a.min())
+    keys = (a - lo).astype(np.int64)
+    span, shift = int(keys.max()), 0
+    while True:
+        keys = keys[np.argsort((keys >> shift & 255).astype(np.uint8), kind="stable")]
+        shift += 8
+        if span >> shift == 0:
+            break
+    return (keys + lo).astype(a.dtype)
+
+
+def final_method(name):
+    # the NumPy routine final_state runs for name; it stands in for the algorithm, it does not time it
+    if name == "Counting Sort":
+        return "NumPy counting sort"
+    if name.startswith("Radix Sort"):
+        return "NumPy radix sort"
+    return f"np.sort ({NUMPY_KINDS.get(name, 'stable')})"
+
+
+def final_state(name, a):
+    a = np.asarray(a)
+    if a.size == 0:
+        return a.copy()
+    if name == "Counting Sort":
+        return counting_sort(a)
+    if name.startswith("Radix Sort"):
+        return radix_sort(a)
+    return np.sort(a, kind=NUMPY_KINDS.get(name, "stable"))
+
+
+def summarize(name, a):
+    a = np.asarray(a)
+    t0 = time.perf_counter()
+    result = final_state(name, a)
+    seconds = time.perf_counter() - t0
+    inv = inversions(a)
+    summary = {"n": int(a.size), "inversions": inv, "runs": runs(a), "distinct": int(np.unique(a).size),
+               "seconds": seconds, "method": final_method(name), "final": result}
+    # operation counts that follow from the input alone: every adjacent swap or shift removes one inversion
+    if name == "Bubble Sort":
+        summary["swaps"] = inv
+    elif name == "Insertion Sort":
+        summary["shifts"] = inv
+    return summary
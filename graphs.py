@@ -0,0 +1,197 @@
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+
+import numpy as np
+
+# Pathfinding on the same frame pipeline as the sorts. The live "array" holds one state code per node, so the
+# recorder, the timeline and both players take a search the way they take a sort: reaching a node is a WRITE,
+# the node being expanded is the step's pivot and the path found is the sorted list. Graphs are CSR, the
+# neighbours of u being targets[offsets[u]:offsets[u + 1]] with an optional weight per edge, all in flat
+# arrays; a 1000x1000 grid is ~20 MB of adjacency rather than a million Python lists.
+
+OPEN, WALL, FRONTIER, VISITED = range(4)
+STATE_NAMES = ("open", "wall", "frontier", "visited")
+
+
+def _column(typecode, values):
+    return array(typecode, np.ascontiguousarray(values, np.dtype(typecode)).tobytes())
+
+
+class Graph:
+    def __init__(self, offsets, targets, weights=None, cols=None):
+        # cols is set for grids: node r * cols + c is cell (r, c), which gives A* its distance estimate
+        self.offsets = _column("q", offsets)
+        self.targets = _column("i", targets)
+        self.weights = None if weights is None else _column("i", weights)
+        self.cols = cols
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        cols = (self.offsets, self.targets) + ((self.weights,) if self.weights is not None else ())
+        return sum(len(c) * c.itemsize for c in cols)
+
+    def neighbours(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+
+def _csr(n, src, dst, w):
+    order = np.argsort(src, kind="stable")
+    offsets = np.zeros(n + 1, np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+    return offsets, dst[order], None if w is None else w[order]
+
+
+def from_edges(n, edges, weights=None, directed=False):
+    edges = np.asarray(edges, np.int64).reshape(-1, 2)
+    src, dst = edges[:, 0], edges[:, 1]
+    w = None if weights is None else np.asarray(weights, np.int64)
+    if not directed:
+        src, dst = np.concatenate((src, dst)), np.concatenate((dst, src))
+        w = None if w is None else np.concatenate((w, w))
+    return Graph(*_csr(n, src, dst, w))
+
+
+def grid(rows, cols, walls=None, costs=None):
+    # 4-connected; walls is a rows x cols bool mask of cells with no edges in or out, costs the price of
+    # stepping onto each cell (unit when None)
+    n = rows * cols
+    ids = np.arange(n, dtype=np.int64).reshape(rows, cols)
+    free = np.ones((rows, cols), bool) if walls is None else ~np.asarray(walls, bool)
+    src, dst = [], []
+    for a, b in ((ids[:-1], ids[1:]), (ids[1:], ids[:-1]), (ids[:, :-1], ids[:, 1:]), (ids[:, 1:], ids[:, :-1])):
+        ok = free.ravel()[a] & free.ravel()[b]
+        src.append(a[ok])
+        dst.append(b[ok])
+    src, dst = np.concatenate(src), np.concatenate(dst)
+    w = None if costs is None else np.asarray(costs, np.int64).ravel()[dst]
+    return Graph(*_csr(n, src, dst, w), cols=cols)
+
+
+def random_walls(rows, cols, density, rng=None, keep=()):
+    # each cell a wall with probability density; cells listed in keep (node ids) stay open
+    rng = rng if rng is not None else np.random.default_rng()
+    walls = rng.random((rows, cols)) < density
+    walls.ravel()[list(keep)] = False
+    return walls
+
+
+def states(n, walls=None):
+    # the initial array a search runs on
+    return [OPEN] * n if walls is None else np.where(np.asarray(walls, bool).ravel(), WALL, OPEN).tolist()
+
+
+def _trace_path(parent, source, target, path):
+    if target is None or (parent[target] < 0 and target != source):
+        return
+    node, back = target, [target]
+    while node != source:
+        node = parent[node]
+        back.append(node)
+    path.extend(reversed(back))
+
+
+def bfs(arr, graph, source=0, target=None):
+    offsets, targets = graph.offsets, graph.targets
+    parent = array("i", [-1]) * len(arr)
+    path = []
+    yield arr, [], [], path
+    arr[source] = FRONTIER
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        arr[u] = VISITED
+        if u == target:
+            break
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if arr[v] == OPEN:
+                arr[v] = FRONTIER
+                parent[v] = u
+                queue.append(v)
+        yield arr, [], [u], path
+    _trace_path(parent, source, target, path)
+    yield arr, [], [], path
+
+
+def dfs(arr, graph, source=0, target=None):
+    # iterative; a node is visited when it comes off the stack, so the tree follows the last edge pushed
+    offsets, targets = graph.offsets, graph.targets
+    parent = array("i", [-1]) * len(arr)
+    path = []
+    yield arr, [], [], path
+    arr[source] = FRONTIER
+    stack = [source]
+    while stack:
+        u = stack.pop()
+        if arr[u] == VISITED:
+            continue
+        arr[u] = VISITED
+        if u == target:
+            break
+        for v in reversed(targets[offsets[u]:offsets[u + 1]]):
+            if arr[v] != VISITED:
+                if arr[v] == OPEN:
+                    arr[v] = FRONTIER
+                parent[v] = u
+                stack.append(v)
+        yield arr, [], [u], path
+    _trace_path(parent, source, target, path)
+    yield arr, [], [], path
+
+
+def _best_first(arr, graph, source, target, estimate):
+    # Dijkstra when estimate is None, A* otherwise. Heap entries are single ints, (f * span + h) * n + node,
+    # so heapq compares machine-sized ints instead of tuples, and among equal f the node nearer the target
+    # comes first; entries a shorter path has since replaced are skipped when popped
+    n = len(arr)
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    parent = array("i", [-1]) * n
+    dist = array("q", [-1]) * n
+    path = []
+    h = estimate or (lambda v: 0)
+    span = h(source) + 1 if estimate else 1
+    yield arr, [], [], path
+    dist[source] = 0
+    arr[source] = FRONTIER
+    heap = [(h(source) * span + h(source)) * n + source]
+    while heap:
+        key, u = divmod(heappop(heap), n)
+        d = key // span - h(u)
+        if arr[u] == VISITED or d > dist[u]:
+            continue
+        arr[u] = VISITED
+        if u == target:
+            break
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            nd = d + (weights[e] if weights is not None else 1)
+            if arr[v] != VISITED and (dist[v] < 0 or nd < dist[v]):
+                dist[v] = nd
+                parent[v] = u
+                if arr[v] == OPEN:
+                    arr[v] = FRONTIER
+                hv = h(v)
+                heappush(heap, ((nd + hv) * span + min(hv, span - 1)) * n + v)
+        yield arr, [], [u], path
+    _trace_path(parent, source, target, path)
+    yield arr, [], [], path
+
+
+def dijkstra(arr, graph, source=0, target=None):
+    return _best_first(arr, graph, source, target, None)
+
+
+def astar(arr, graph, source=0, target=None):
+    # Manhattan distance times the cheapest step on grids, which never overestimates; plain Dijkstra on
+    # graphs with no layout or no target
+    if graph.cols is None or target is None:
+        return _best_first(arr, graph, source, target, None)
+    cols, tr, tc = graph.cols, *divmod(target, graph.cols)
+    step = min(graph.weights) if graph.weights is not None and len(graph.weights) else 1
+    return _best_first(arr, graph, source, target, lambda v: (abs(v // cols - tr) + abs(v % cols - tc)) * step)
+
+
+GRAPH_ALGORITHMS = {"BFS": bfs, "DFS": dfs, "Dijkstra": dijkstra, "A*": astar}
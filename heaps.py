@@ -0,0 +1,47 @@
+from sorts import sift_down
+
+# Binary heap operations on the frame pipeline. The heap is a max-heap in arr[:size], the layout heap_sort
+# builds; a push sifts arr[size] up into it, a pop swaps the root out to arr[size - 1] and sifts down.
+
+def sift_up(arr, i, sorted_idx):
+    while i > 0:
+        parent = (i - 1) // 2
+        yield arr, [parent, i], [i], sorted_idx
+        if not arr[parent] < arr[i]:
+            return
+        arr[parent], arr[i] = arr[i], arr[parent]
+        yield arr, [parent, i], [parent], sorted_idx
+        i = parent
+
+def heap_push(arr, size, sorted_idx):
+    yield from sift_up(arr, size, sorted_idx)
+    return size + 1
+
+def heap_pop(arr, size, sorted_idx):
+    arr[0], arr[size - 1] = arr[size - 1], arr[0]
+    sorted_idx.append(size - 1)
+    yield arr, [0, size - 1], [], sorted_idx
+    yield from sift_down(arr, 0, 0, size - 1, sorted_idx)
+    return size - 1
+
+def build_heap(arr):
+    # Floyd's bottom-up heapify, O(n) against the O(n log n) of n pushes
+    n = len(arr)
+    yield arr, [], [], []
+    for start in range(n // 2 - 1, -1, -1):
+        yield from sift_down(arr, 0, start, n, [])
+    yield arr, [], [], []
+
+def push_pop(arr, pops=None):
+    # the heap grows one push at a time over the array, then pops take the largest out to the back
+    n = len(arr)
+    sorted_idx = []
+    yield arr, [], [], sorted_idx
+    size = 0
+    for _ in range(n):
+        size = yield from heap_push(arr, size, sorted_idx)
+    for _ in range(n if pops is None else min(pops, n)):
+        size = yield from heap_pop(arr, size, sorted_idx)
+    yield arr, [], [], sorted_idx
+
+HEAP_OPERATIONS = {"Push all, then pop all": push_pop, "Build heap (Floyd)": build_heap}
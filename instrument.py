@@ -0,0 +1,152 @@
+import time
+
+# Instrumentation is opt-in per run: the generators only see a probe when one is passed, and comparisons
+# and writes are counted by handing the algorithm wrapped elements in a counting list. With no probe the
+# generators run exactly the code they always did, plus one `is not None` test per helper, merge or
+# partition call.
+
+
+class Stats:
+    def __init__(self):
+        self.frames = 0
+        self.comparisons = 0
+        self.writes = 0
+        self.swaps = 0
+        self.max_depth = 0
+        self.aux = 0
+        self.max_aux = 0
+        self.phases = {}
+        self._stack = ["sort"]
+        self._open = {}
+        self._mark = None
+
+    def _charge(self, now):
+        if self._mark is not None:
+            top = self._stack[-1]
+            self.phases[top] = self.phases.get(top, 0.0) + now - self._mark
+            self._mark = now
+
+    # phase time is self time: nested phases are not charged to their parent, and time spent outside
+    # the generator (between yields) is not charged at all. Recursion depth is the deepest nesting of
+    # any one phase inside itself.
+    def enter(self, phase):
+        self._charge(time.perf_counter())
+        self._stack.append(phase)
+        depth = self._open[phase] = self._open.get(phase, 0) + 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def exit(self):
+        self._charge(time.perf_counter())
+        self._open[self._stack.pop()] -= 1
+
+    def depth(self, depth):
+        # for drivers that keep their own stack instead of nesting phases
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def alloc(self, elements):
+        self.aux += elements
+        if self.aux > self.max_aux:
+            self.max_aux = self.aux
+
+    def free(self, elements):
+        self.aux -= elements
+
+    def resume(self):
+        self._mark = time.perf_counter()
+
+    def suspend(self):
+        self._charge(time.perf_counter())
+        self._mark = None
+
+    def as_dict(self):
+        return {"frames": self.frames, "comparisons": self.comparisons, "writes": self.writes, "swaps": self.swaps,
+                "max_depth": self.max_depth, "aux_peak": self.max_aux, "phases": dict(self.phases)}
+
+
+class _Counted:
+    __slots__ = ("v", "stats")
+
+    def __init__(self, v, stats):
+        self.v = v
+        self.stats = stats
+
+    def _cmp(self, other):
+        self.stats.comparisons += 1
+        return other.v if isinstance(other, _Counted) else other
+
+    def __lt__(self, other):
+        return self.v < self._cmp(other)
+
+    def __le__(self, other):
+        return self.v <= self._cmp(other)
+
+    def __gt__(self, other):
+        return self.v > self._cmp(other)
+
+    def __ge__(self, other):
+        return self.v >= self._cmp(other)
+
+    def __eq__(self, other):
+        return self.v == self._cmp(other)
+
+    def __sub__(self, other):
+        # key arithmetic for the distribution sorts (counting, radix) reads values without comparing them
+        return self.v - (other.v if isinstance(other, _Counted) else other)
+
+    __hash__ = None
+
+
+class _CountingList(list):
+    # counts element stores, recognises a store pair that exchanges two slots as a swap, and mirrors
+    # the raw values into the caller's list so frames can be rendered as usual
+    __slots__ = ("stats", "mirror", "last")
+
+    def __setitem__(self, k, v):
+        if isinstance(k, slice):
+            list.__setitem__(self, k, v)
+            self.mirror[k] = [x.v for x in list.__getitem__(self, k)]
+            self.stats.writes += len(self.mirror[k])
+            self.last = None
+            return
+        old = list.__getitem__(self, k)
+        list.__setitem__(self, k, v)
+        self.mirror[k] = v.v
+        stats = self.stats
+        stats.writes += 1
+        last = self.last
+        if last is not None and last[0] != k and last[1] is old and last[2] is v:
+            stats.swaps += 1
+            self.last = None
+        else:
+            self.last = (k, v, old)
+
+
+def _accepts_probe(algorithm):
+    code = getattr(algorithm, "func", algorithm).__code__
+    return "probe" in code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+
+
+def instrumented(algorithm, arr, stats):
+    # drop-in for algorithm(arr): sorts arr in place and yields the same frames while filling stats
+    counted = _CountingList(_Counted(v, stats) for v in arr)
+    counted.stats, counted.mirror, counted.last = stats, arr, None
+    gen = algorithm(counted, probe=stats) if _accepts_probe(algorithm) else algorithm(counted)
+    while True:
+        stats.resume()
+        try:
+            _, highlights, pivots, sorted_indices = next(gen)
+        except StopIteration:
+            stats.suspend()
+            return
+        stats.suspend()
+        stats.frames += 1
+        yield arr, highlights, pivots, sorted_indices
+
+
+def profile(algorithm, arr):
+    stats = Stats()
+    for _ in instrumented(algorithm, list(arr), stats):
+        pass
+    return stats
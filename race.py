@@ -0,0 +1,66 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from instrument import profile
+from sorts import lookup
+from tracing import record
+
+# A race computes every lane to completion up front, in parallel, and ships the recorded traces to the
+# browser, which plays them side by side against one clock. Compute never waits on rendering and a slow
+# lane cannot stall the others' frames; the page only ever paints.
+
+LANES = (2, 8)
+# below this many elements a lane is cheaper than shipping it to another process
+PROCESS_MIN = 2000
+LOCKSTEP = {"By steps": "steps", "By wall-clock": "clock"}
+
+_pools = {}
+
+
+def time_lane(spec, arr):
+    # CPU time of this thread only, so a lane is not charged for another holding the core
+    algorithm = lookup(spec)
+    a = list(arr)
+    t0 = time.thread_time()
+    for _ in algorithm(a):
+        pass
+    return time.thread_time() - t0
+
+
+def run_lane(spec, arr, timed=True):
+    algorithm = lookup(spec)
+    seconds = time_lane(spec, arr) if timed else None
+    stats = profile(algorithm, arr).as_dict()
+    trace = record(algorithm, arr)
+    return {"name": spec, "seconds": seconds, "steps": len(trace), "comparisons": stats["comparisons"],
+            "writes": stats["writes"], "swaps": stats["swaps"], "trace": trace.to_payload()}
+
+
+def _pool(kind):
+    if kind not in _pools:
+        workers = min(LANES[1], os.cpu_count() or 1)
+        _pools[kind] = ProcessPoolExecutor(workers) if kind == "process" else ThreadPoolExecutor(LANES[1])
+    return _pools[kind]
+
+
+def run_race(lanes, arr, executor=None):
+    # returns one result per lane, in the order given
+    if not LANES[0] <= len(lanes) <= LANES[1]:
+        raise ValueError(f"a race needs {LANES[0]} to {LANES[1]} lanes, got {len(lanes)}")
+    kind = executor or ("process" if len(arr) >= PROCESS_MIN else "thread")
+    arr = list(arr)
+    if kind == "process":
+        return list(_pool(kind).map(run_lane, lanes, [arr] * len(lanes)))
+    # threads share one GIL, so the lanes are timed one after another on this thread instead, which at
+    # these sizes costs a few milliseconds each
+    results = list(_pool(kind).map(run_lane, lanes, [arr] * len(lanes), [False] * len(lanes)))
+    for result in results:
+        result["seconds"] = time_lane(result["name"], arr)
+    return results
+
+
+def standings(results, by="steps"):
+    # lane indices from winner to last; ties keep lane order
+    key = "seconds" if by == "clock" else "steps"
+    return sorted(range(len(results)), key=lambda i: results[i][key])
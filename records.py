@@ -0,0 +1,52 @@
+from functools import cmp_to_key
+
+from sorts import lookup
+
+# Sorting records (tuples, strings, floats, log lines by timestamp) instead of bare ints. Keys are extracted
+# once, up front: one C-level sort of the keys ranks the records, and the generators then run on the dense
+# ranks exactly as they run on integer arrays everywhere else. key() or cmp() is never called during the
+# animation, every comparison the algorithm makes is an int comparison, and bar heights follow rank instead
+# of the keys' own scale, which may not be numeric at all.
+
+
+class Rank(int):
+    # each record gets its own Rank object, so the record can be found again after the sort has moved it;
+    # with no instance dict it is barely bigger than a plain int and compares just as fast
+    __slots__ = ()
+
+
+def ranks(records, key=None, cmp=None, reverse=False):
+    # dense ranks from 1, equal keys sharing one; reverse flips them, which keeps ties in input order the way
+    # list.sort(reverse=True) does
+    if key is not None and cmp is not None:
+        raise ValueError("pass key or cmp, not both")
+    keys = list(map(key, records)) if key is not None else list(records)
+    if cmp is not None:
+        keys = list(map(cmp_to_key(cmp), keys))
+    out = [0] * len(keys)
+    r, prev = 0, None
+    for i in sorted(range(len(keys)), key=keys.__getitem__):
+        if r == 0 or prev < keys[i]:
+            r += 1
+            prev = keys[i]
+        out[i] = r
+    return [r + 1 - v for v in out] if reverse else out
+
+
+def decorate(records, key=None, cmp=None, reverse=False):
+    return [Rank(v) for v in ranks(records, key, cmp, reverse)]
+
+
+def undecorate(records, decorated, ranked):
+    # decorated is the list decorate() returned, ranked the same Rank objects in the order the sort left them
+    at = {id(r): i for i, r in enumerate(decorated)}
+    return [records[at[id(r)]] for r in ranked]
+
+
+def sort_records(spec, records, key=None, cmp=None, reverse=False, **options):
+    # frames over the ranks like any generator; once it finishes, records is reordered in place. Whether
+    # equal keys keep their input order depends on the algorithm, see sorts.STABLE
+    decorated = decorate(records, key, cmp, reverse)
+    ranked = list(decorated)
+    yield from lookup(spec)(ranked, **options)
+    records[:] = undecorate(records, decorated, ranked)
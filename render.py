@@ -0,0 +1,379 @@
+import os
+import sys
+from array import array
+from base64 import b64encode
+from functools import lru_cache
+
+import numpy as np
+
+UNSORTED, COMPARING, PIVOT, SORTED = range(4)
+STATE_NAMES = ("unsorted", "comparing", "pivot", "sorted")
+_DIGITS = bytes.maketrans(bytes(range(4)), b"0123")
+_ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components")
+# above this many bars the div renderer stops keeping up and "Auto" switches to the raster canvas
+CANVAS_MIN_BARS = 200
+# past this many bars a value label gets under ~17px of a 1100px row and stops being readable
+LABEL_MAX_BARS = 64
+# level of detail: past this many bars, bars are grouped into buckets of neighbours, one per column drawn
+HTML_BUCKETS = CANVAS_MIN_BARS
+LOD_BUCKETS = 1200
+# bucket states by importance: comparing > pivot > sorted > unsorted
+_RANK = np.array([3, 0, 1, 2], np.uint8)
+_BY_RANK = np.array([1, 2, 3, 0], np.uint8)
+
+THEME = {
+    "unsorted": {"bg": "#0ea5e9", "glow": "rgba(14,165,233,0.5)", "border": "#0284c7"},
+    "comparing": {"bg": "#ec4899", "glow": "rgba(236,72,153,0.6)", "border": "#db2777"},
+    "pivot": {"bg": "#eab308", "glow": "rgba(234,179,8,0.6)", "border": "#ca8a04"},
+    "sorted": {"bg": "#10b981", "glow": "rgba(16,185,129,0.5)", "border": "#059669"},
+}
+# grid cells (graphs.STATE_NAMES), then the step states drawn over them; components/grid_view.js matches
+GRID_THEME = {
+    "open": {"bg": "#1f2937", "glow": "rgba(31,41,55,0.5)"},
+    "wall": {"bg": "#6b7280", "glow": "rgba(107,114,128,0.5)"},
+    "frontier": {"bg": "#0ea5e9", "glow": "rgba(14,165,233,0.5)"},
+    "visited": {"bg": "#075985", "glow": "rgba(7,89,133,0.5)"},
+    "expanding": {"bg": "#eab308", "glow": "rgba(234,179,8,0.6)"},
+    "path": {"bg": "#10b981", "glow": "rgba(16,185,129,0.5)"},
+}
+
+
+@lru_cache(maxsize=8192)
+def _bar(h, state, font_size, val):
+    c = THEME[STATE_NAMES[state]]
+    return f'<div style="flex:1;height:{h}%;background:linear-gradient(180deg,{c["bg"]} 0%,{c["border"]} 100%);border-radius:8px 8px 0 0;box-shadow:0 -4px 15px {c["glow"]},inset 0 2px 4px rgba(255,255,255,0.3);display:flex;justify-content:center;align-items:flex-start;transition:height 0.15s ease"><span style="color:white;font-weight:800;font-size:{font_size};margin-top:6px;text-shadow:1px 1px 2px rgba(0,0,0,0.8)">{val}</span></div>'
+
+
+def bar_states(n, highlights, pivots, sorted_indices):
+    states = bytearray(n)
+    for i in pivots:
+        states[i] = PIVOT
+    for i in highlights:
+        states[i] = COMPARING
+    for i in sorted_indices:
+        states[i] = SORTED
+    return states
+
+
+@lru_cache(maxsize=8192)
+def _span(h, low, state):
+    # a bucket of bars: solid up to its shortest bar, faded from there to its tallest
+    c = THEME[STATE_NAMES[state]]
+    return f'<div style="flex:1;height:{h}%;background:linear-gradient(0deg,{c["bg"]} {low}%,{c["bg"]}66 {low}%)"></div>'
+
+
+def buckets(vals, states, count):
+    # groups vals into `count` runs of neighbours: (starts, lowest, highest, most important state) per bucket
+    n = len(vals)
+    starts = np.arange(count + 1) * n // count
+    v = np.asarray(vals, np.int64)
+    rank = _RANK[np.frombuffer(bytes(states), np.uint8)]
+    return (starts, np.minimum.reduceat(v, starts[:-1]), np.maximum.reduceat(v, starts[:-1]),
+            _BY_RANK[np.minimum.reduceat(rank, starts[:-1])])
+
+
+def color_bars(arr, highlights, pivots, sorted_indices, states=None):
+    n = len(arr)
+    font_size = "14px" if n <= 20 else "12px" if n <= 35 else "10px" if n <= 50 else "8px"
+    if states is None:
+        states = bar_states(n, highlights, pivots, sorted_indices)
+    if n > HTML_BUCKETS:
+        _, lo, hi, top = buckets(arr, states, HTML_BUCKETS)
+        max_val = int(hi.max()) or 1
+        bars = [_span(max(5, int(h * 100 / max_val)), int(low * 100 / max(h, 1)), state)
+                for low, h, state in zip(lo.tolist(), hi.tolist(), top.tolist())]
+    else:
+        max_val = max(arr) if arr else 1
+        bars = [_bar(max(5, int((val / max_val) * 100)), state, font_size, val if n <= LABEL_MAX_BARS else "") for val, state in zip(arr, states)]
+    gap = "4px" if len(bars) <= LABEL_MAX_BARS else "1px" if len(bars) < HTML_BUCKETS else "0"
+    return '<div style="background:#111827;border:1px solid #1f2937;border-radius:16px;padding:24px;box-shadow:0 10px 25px rgba(0,0,0,0.5)"><div style="display:flex;align-items:flex-end;justify-content:center;height:500px;gap:' + gap + '">' + "".join(bars) + '</div></div>'
+
+
+@lru_cache(maxsize=None)
+def render_legend(grid=False):
+    items = [(k, v) for k, v in (GRID_THEME if grid else THEME).items()]
+    legend = '<div style="display:flex;justify-content:center;gap:30px;margin-top:20px;padding:15px;background:#111827;border-radius:12px;border:1px solid #1f2937">'
+    for name, c in items:
+        legend += f'<div style="display:flex;align-items:center;gap:10px"><div style="width:16px;height:16px;border-radius:4px;background:{c["bg"]};box-shadow:0 0 10px {c["glow"]}"></div><span style="color:#d1d5db;font-weight:600;font-size:14px">{name.capitalize()}</span></div>'
+    return legend + '</div>'
+
+
+def render_stats(stats):
+    rows = [("Frames", stats["frames"]), ("Comparisons", stats["comparisons"]), ("Writes", stats["writes"]), ("Swaps", stats["swaps"]),
+            ("Recursion depth", stats["max_depth"]), ("Aux elements (peak)", stats["aux_peak"])]
+    rows += [(f"Time in {phase}", f"{seconds * 1e3:.2f} ms") for phase, seconds in stats["phases"].items()]
+    return _stat_rows(rows)
+
+
+def render_summary(summary):
+    rows = [("Elements", summary["n"]), ("Distinct values", summary["distinct"]), ("Inversions", f"{summary['inversions']:,}"),
+            ("Ascending runs", summary["runs"])]
+    rows += [(label, f"{summary[key]:,}") for key, label in (("swaps", "Swaps"), ("shifts", "Shifts")) if key in summary]
+    rows.append((f"Final state via {summary['method']}", f"{summary['seconds'] * 1e3:.2f} ms"))
+    return _stat_rows(rows)
+
+
+def render_cache_stats(stats):
+    rows = [("Trace cache hits", stats["hits"]), ("Disk hits", stats["disk_hits"]), ("Misses", stats["misses"]),
+            ("Evictions", stats["evictions"]), ("Cached traces", stats["entries"]),
+            ("Cache memory", f"{stats['bytes'] / 2**20:.1f} / {stats['budget'] / 2**20:.0f} MB")]
+    return _stat_rows(rows)
+
+
+def render_load(metrics):
+    rows = [("Live animations", f"{metrics['active']} / {metrics['limit']}"), ("Waiting for a slot", metrics["waiting"]),
+            ("Frames sent", f"{metrics['frames_per_s']:.0f}/s"), ("Bytes sent", f"{metrics['bytes_per_s'] / 1024:.1f} KB/s"),
+            ("Cancelled by reruns", metrics["cancelled"])]
+    return _stat_rows(rows)
+
+
+def _stat_rows(rows):
+    html = '<div style="margin-top:1.5rem;padding:12px 15px;background:#0b0f19;border-radius:12px;border:1px solid #1f2937">'
+    for label, value in rows:
+        html += f'<div style="display:flex;justify-content:space-between;font-size:13px;padding:2px 0"><span style="color:#9ca3af;font-weight:600">{label}</span><span style="color:#f3f4f6;font-weight:800">{value}</span></div>'
+    return html + '</div>'
+
+
+class StateTracker:
+    # per-index state bytes (sorted > comparing > pivot > unsorted) updated from the frame diff only
+    def __init__(self, n):
+        self.n = n
+        self.states = bytearray(n)
+        self.sorted = bytearray(n)
+        self._shadow = []
+        self._sorted_obj = None
+        self._marked = set()
+
+    def update(self, highlights, pivots, sorted_indices):
+        touched = self._marked
+        ns, nh = len(sorted_indices), len(self._shadow)
+        if (sorted_indices is self._sorted_obj and ns >= nh) or (ns >= nh and sorted_indices[:nh] == self._shadow):
+            fresh = sorted_indices[nh:]
+        else:
+            touched.update(self._shadow)
+            self.sorted = bytearray(self.n)
+            self._shadow = []
+            fresh = sorted_indices
+        srt = self.sorted
+        for i in fresh:
+            srt[i] = 1
+        touched.update(fresh)
+        self._shadow.extend(fresh)
+        self._sorted_obj = sorted_indices
+        hl, pv = set(highlights), set(pivots)
+        touched |= hl
+        touched |= pv
+        states = self.states
+        for i in touched:
+            states[i] = SORTED if srt[i] else COMPARING if i in hl else PIVOT if i in pv else UNSORTED
+        self._marked = hl | pv
+        return touched
+
+
+class LevelOfDetail:
+    # bars grouped into buckets; each keeps its lowest and highest value and a count per state, so a changed
+    # bar updates its bucket in O(1). Only a bucket whose lowest or highest bar was overwritten is rescanned.
+    def __init__(self, vals, states, count=LOD_BUCKETS):
+        n = len(vals)
+        self.count = min(count, n)
+        starts, lo, hi, _ = buckets(vals, states, self.count)
+        self.starts = starts.tolist()
+        self.of = array("i", np.repeat(np.arange(self.count, dtype=np.int32), np.diff(starts)).tobytes())
+        self.lo, self.hi = lo.tolist(), hi.tolist()
+        self.counts = np.bincount(np.frombuffer(self.of, np.int32) * 4 + np.frombuffer(bytes(states), np.uint8),
+                                  minlength=self.count * 4).tolist()
+        self.vals = list(vals)
+        self.states = bytearray(states)
+
+    def state(self, b):
+        c = self.counts
+        for s in (COMPARING, PIVOT, SORTED):
+            if c[4 * b + s]:
+                return s
+        return UNSORTED
+
+    def update(self, changed, arr, states):
+        # applies the bars in changed; returns the buckets whose look changed
+        of, vals, st, lo, hi, counts = self.of, self.vals, self.states, self.lo, self.hi, self.counts
+        dirty, stale = set(), set()
+        for i in changed:
+            b = of[i]
+            s, old = states[i], st[i]
+            if s != old:
+                counts[4 * b + old] -= 1
+                counts[4 * b + s] += 1
+                st[i] = s
+                dirty.add(b)
+            v, old = arr[i], vals[i]
+            if v != old:
+                vals[i] = v
+                dirty.add(b)
+                if v > hi[b]:
+                    hi[b] = v
+                elif old == hi[b]:
+                    stale.add(b)
+                if v < lo[b]:
+                    lo[b] = v
+                elif old == lo[b]:
+                    stale.add(b)
+        for b in stale:
+            seg = vals[self.starts[b]:self.starts[b + 1]]
+            lo[b], hi[b] = min(seg), max(seg)
+        return dirty
+
+
+class BarStream:
+    # turns frames into small payloads for the bar_stream component: a keyframe with every value and state,
+    # then only the bars that differ from that keyframe until the next one.
+    # binary keyframes carry int32 values and state bytes base64-encoded for the raster canvas; past
+    # LOD_BUCKETS bars they carry buckets instead (with each one's lowest value), and so do the deltas
+    def __init__(self, stream_id="bars", keyframe_every=120, binary=False, lod=LOD_BUCKETS):
+        self.stream_id = stream_id
+        self.keyframe_every = keyframe_every
+        self.binary = binary
+        self.lod_above = lod
+        self.seq = 0
+        self.key = -1
+        self.tracker = None
+        self.lod = None
+
+    def _keyframe(self, arr, max_val):
+        self.key += 1
+        self.since_key = 0
+        self.pending = {}
+        if self.lod is not None:
+            lod = self.lod
+            return {"id": self.stream_id, "k": self.key, "max": max_val, "n": lod.count, "vb": _b64(lod.hi), "lb": _b64(lod.lo),
+                    "sb": b64encode(bytes(lod.state(b) for b in range(lod.count))).decode()}
+        self.vals = list(arr)
+        if self.binary:
+            return {"id": self.stream_id, "k": self.key, "max": max_val, "n": len(arr),
+                    "vb": _b64(arr), "sb": b64encode(self.tracker.states).decode()}
+        return {"id": self.stream_id, "k": self.key, "max": max_val, "v": self.vals[:],
+                "s": self.tracker.states.translate(_DIGITS).decode()}
+
+    def __call__(self, arr, highlights, pivots, sorted_indices):
+        self.seq += 1
+        n = len(arr)
+        if self.tracker is None or self.tracker.n != n:
+            self.tracker = StateTracker(n)
+            self.tracker.update(highlights, pivots, sorted_indices)
+            self.lod = LevelOfDetail(arr, self.tracker.states, self.lod_above) if n > self.lod_above else None
+            return self._keyframe(arr, max(arr) if arr else 1)
+        changed = self.tracker.update(highlights, pivots, sorted_indices)
+        if self.lod is not None:
+            return self._buckets(arr, changed)
+        max_val = max(arr) if arr else 1
+        vals = self.vals
+        for i in changed:
+            vals[i] = arr[i]
+        if vals != arr:
+            changed = changed | {i for i, (x, y) in enumerate(zip(arr, vals)) if x != y}
+            vals[:] = arr
+        states, pending = self.tracker.states, self.pending
+        for i in changed:
+            pending[i] = (arr[i], states[i])
+        self.since_key += 1
+        if self.since_key >= self.keyframe_every or len(pending) * 4 > n:
+            return self._keyframe(arr, max_val)
+        d = []
+        for i, (v, s) in pending.items():
+            d += (i, v, s)
+        return {"id": self.stream_id, "k": self.key, "max": max_val, "d": d}
+
+    def _buckets(self, arr, changed):
+        lod, states = self.lod, self.tracker.states
+        dirty = lod.update(changed, arr, states)
+        if lod.vals != arr:
+            dirty |= lod.update(_differ(arr, lod.vals), arr, states)
+        pending = self.pending
+        for b in dirty:
+            pending[b] = (lod.lo[b], lod.hi[b], lod.state(b))
+        max_val = max(lod.hi)
+        self.since_key += 1
+        if self.since_key >= self.keyframe_every or len(pending) * 4 > lod.count:
+            return self._keyframe(arr, max_val)
+        q = []
+        for b, (lo, hi, s) in pending.items():
+            q += (b, lo, hi, s)
+        return {"id": self.stream_id, "k": self.key, "max": max_val, "q": q}
+
+
+def _differ(a, b, block=4096):
+    # indices where two equal-length lists differ; blocks are compared in C and only mismatching ones walked
+    out = []
+    for lo in range(0, len(a), block):
+        if a[lo:lo + block] != b[lo:lo + block]:
+            out += [lo + i for i, (x, y) in enumerate(zip(a[lo:lo + block], b[lo:lo + block])) if x != y]
+    return out
+
+
+def _b64(vals):
+    col = array("i", vals)
+    if sys.byteorder == "big":
+        col.byteswap()
+    return b64encode(col.tobytes()).decode()
+
+
+_components = {}
+
+
+# shared scripts each component is built on, in load order
+_SCRIPTS = {"bar_stream": ("bar_views.js",), "trace_player": ("bar_views.js", "grid_view.js", "timeline.js", "player.js"), "race_player": ("bar_views.js", "timeline.js")}
+
+
+def _read(fname):
+    with open(os.path.join(_ASSETS, fname)) as f:
+        return f.read()
+
+
+def _component(name):
+    # every component is its shared scripts plus its own, styled by the shared bars.css
+    if name not in _components:
+        import streamlit as st
+        js = "\n".join(_read(fname) for fname in _SCRIPTS[name] + (name + ".js",))
+        _components[name] = st.components.v2.component(name, js=js, css=_read("bars.css"))
+    return _components[name]
+
+
+def bar_stream(payload, key):
+    return _component("bar_stream")(data=payload, key=key)
+
+
+def player_payload(trace, trace_id, grid=None):
+    # grid: columns per row, for traces of a grid search (graphs.py), drawn one cell per node
+    payload = trace.to_payload()
+    payload.update(trace=trace_id, raster=len(trace.initial) > CANVAS_MIN_BARS, autoplay=True)
+    if grid:
+        payload["grid"] = grid
+    return payload
+
+
+def trace_player(payload, fps, key="player"):
+    return _component("trace_player")(data=dict(payload, id=key, fps=fps), key=key)
+
+
+def race_payload(results, race_id):
+    lanes = [{"name": r["name"], "seconds": r["seconds"], "trace": r["trace"]} for r in results]
+    return {"race": race_id, "lanes": lanes, "raster": results[0]["trace"]["n"] > CANVAS_MIN_BARS}
+
+
+def race_player(payload, mode, fps, duration, key="race"):
+    return _component("race_player")(data=dict(payload, id=key, mode=mode, fps=fps, duration=duration), key=key)
+
+
+def render_race_table(results, order):
+    head = "".join(f'<th style="padding:6px 10px;text-align:{"left" if i < 2 else "right"}">{h}</th>'
+                   for i, h in enumerate(("#", "Algorithm", "Steps", "Comparisons", "Writes", "Swaps", "Time")))
+    body = ""
+    for place, i in enumerate(order, 1):
+        r = results[i]
+        cells = (place, r["name"], f'{r["steps"]:,}', f'{r["comparisons"]:,}', f'{r["writes"]:,}', f'{r["swaps"]:,}', f'{r["seconds"] * 1e3:.2f} ms')
+        body += "<tr>" + "".join(f'<td style="padding:6px 10px;border-top:1px solid #1f2937;text-align:{"left" if j < 2 else "right"}">{c}</td>' for j, c in enumerate(cells)) + "</tr>"
+    return f'<table style="width:100%;margin-top:20px;border-collapse:collapse;background:#111827;border-radius:12px;color:#d1d5db;font-size:14px"><thead style="color:#9ca3af">{head}</thead><tbody>{body}</tbody></table>'
+
+
+def pick_renderer(choice, n):
+    if choice == "Auto":
+        return "Canvas" if n > CANVAS_MIN_BARS else "Incremental"
+    return choice
@@ -0,0 +1,51 @@
+import time
+
+
+class FrameScheduler:
+    # Paces a frame generator at `rate` logical steps per second while rendering at most `fps` frames per
+    # second. Steps that would land before the next render slot, or that are already behind the wall clock
+    # because the renderer was slow, are folded into the next emitted frame: highlights and pivots are
+    # unioned, the array and sorted indices are the latest. Iterating yields (frame, steps merged).
+    def __init__(self, frames, rate, fps=30, clock=time.perf_counter, sleep=time.sleep):
+        self.frames = frames
+        self.rate = rate
+        self.budget = 1 / fps
+        self.clock = clock
+        self.sleep = sleep
+        self.steps = 0
+        self.rendered = 0
+
+    def __iter__(self):
+        clock, rate = self.clock, self.rate
+        t0 = clock()
+        last_emit = t0 - self.budget
+        highlights, pivots, pending, frame = {}, {}, 0, None
+        for frame in self.frames:
+            self.steps += 1
+            pending += 1
+            highlights.update(dict.fromkeys(frame[1]))
+            pivots.update(dict.fromkeys(frame[2]))
+            due = t0 + self.steps / rate
+            if due < max(last_emit + self.budget, clock()):
+                continue
+            wait = due - clock()
+            if wait > 0:
+                self.sleep(wait)
+            last_emit = clock()
+            yield self._emit(frame, highlights, pivots, pending)
+            highlights, pivots, pending = {}, {}, 0
+        if pending:
+            wait = t0 + self.steps / rate - clock()
+            if wait > 0:
+                self.sleep(wait)
+            yield self._emit(frame, highlights, pivots, pending)
+
+    def _emit(self, frame, highlights, pivots, pending):
+        self.rendered += 1
+        if pending == 1:
+            return frame, 1
+        return (frame[0], list(highlights), list(pivots), frame[3]), pending
+
+
+def count_steps(algorithm, arr):
+    return sum(1 for _ in algorithm(list(arr)))
@@ -0,0 +1,60 @@
+# Searches over a sorted array on the sorts' frame pipeline: the probe is highlighted, the bounds of what is
+# left to search are the pivots and a hit is marked sorted. Each generator returns the index it found, or -1.
+
+def bisect(arr, target, lo, hi, found):
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        yield arr, [mid], [lo, hi], found
+        if arr[mid] < target:
+            lo = mid + 1
+        elif target < arr[mid]:
+            hi = mid - 1
+        else:
+            return mid
+    return -1
+
+def binary_search(arr, target):
+    found = []
+    yield arr, [], [], found
+    i = yield from bisect(arr, target, 0, len(arr) - 1, found)
+    if i >= 0:
+        found.append(i)
+    yield arr, [], [], found
+    return i
+
+def interpolation_search(arr, target):
+    # probes where target would sit if the values were spread evenly between the bounds
+    found = []
+    lo, hi, i = 0, len(arr) - 1, -1
+    yield arr, [], [], found
+    while lo <= hi and not target < arr[lo] and not arr[hi] < target:
+        pos = lo if arr[hi] == arr[lo] else lo + (target - arr[lo]) * (hi - lo) // (arr[hi] - arr[lo])
+        yield arr, [pos], [lo, hi], found
+        if arr[pos] < target:
+            lo = pos + 1
+        elif target < arr[pos]:
+            hi = pos - 1
+        else:
+            i = pos
+            break
+    if i >= 0:
+        found.append(i)
+    yield arr, [], [], found
+    return i
+
+def exponential_search(arr, target):
+    # doubles the bound until it passes target, then binary searches the last doubling
+    n = len(arr)
+    found = []
+    yield arr, [], [], found
+    bound = 1
+    while bound < n and arr[bound - 1] < target:
+        yield arr, [bound - 1], [0, min(2 * bound, n) - 1], found
+        bound *= 2
+    i = yield from bisect(arr, target, bound // 2, min(bound, n) - 1, found)
+    if i >= 0:
+        found.append(i)
+    yield arr, [], [], found
+    return i
+
+SEARCHES = {"Binary Search": binary_search, "Interpolation Search": interpolation_search, "Exponential Search": exponential_search}
@@ -0,0 +1,169 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from scheduler import FrameScheduler
+
+# Live animations for many sessions at once. Pacing and rendering run on a shared pool with a fixed number
+# of slots; a session's script thread only ships the payloads its animation puts in a short queue. Starting
+# an animation cancels the one the same session already had, so a rerun never leaves an orphan behind, and
+# sessions past the limit wait for a free slot instead of all animating at once.
+
+MAX_ACTIVE = 8
+# seconds of history behind the frames/s and bytes/s figures
+WINDOW = 5.0
+_DONE = object()
+
+
+def payload_bytes(payload):
+    if isinstance(payload, str):
+        return len(payload.encode())
+    return len(json.dumps(payload, separators=(",", ":")))
+
+
+class Animation:
+    def __init__(self, pool, session, frames, rate, render, fps, depth):
+        self.pool = pool
+        self.session = session
+        self.cancelled = threading.Event()
+        # waiting on the cancel flag instead of sleeping lets a cancel free the slot at once
+        self.scheduler = FrameScheduler(frames, rate, fps, sleep=self.cancelled.wait)
+        self.render = render
+        self.frames = queue.Queue(depth)
+        self.started = threading.Event()
+        self.shipped = 0
+        self.finished = False
+        self.error = None
+        self.future = None
+
+    @property
+    def waiting(self):
+        return not self.started.is_set() and not self.cancelled.is_set()
+
+    def cancel(self):
+        # True if this stopped an animation that was still running or waiting
+        live = not self.finished and not self.cancelled.is_set()
+        self.cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+        return live
+
+    def _put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(self):
+        # worker side: pace, render and hand over; a full queue holds the scheduler back, which then folds
+        # the steps it fell behind on into its next frame
+        self.started.set()
+        self.pool._moved(+1)
+        try:
+            for frame, steps in self.scheduler:
+                if self.cancelled.is_set():
+                    return
+                if not self._put((self.render(frame), steps, time.perf_counter())):
+                    return
+        except Exception as e:
+            self.error = e
+        finally:
+            self.pool._moved(-1)
+            self._put(_DONE)
+
+    def __iter__(self):
+        # script side: yields (payload, steps merged) until the animation ends or is cancelled
+        while not self.cancelled.is_set():
+            try:
+                item = self.frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                self.finished = True
+                break
+            payload, steps, t = item
+            yield payload, steps
+            self.shipped += 1
+            self.pool._sent(payload_bytes(payload), time.perf_counter() - t)
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # leaving early, e.g. when Streamlit stops the script for a rerun, cancels the animation
+        self.pool._cancel(self)
+
+
+class AnimationPool:
+    # one per server process (see app.animations); thread-safe
+    def __init__(self, max_active=MAX_ACTIVE, fps=30, depth=4):
+        self.max_active = max_active
+        self.fps = fps
+        self.depth = depth
+        self._executor = ThreadPoolExecutor(max_active, thread_name_prefix="animation")
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._active = 0
+        self._events = deque()
+        self._latency = deque(maxlen=10000)
+        self.frames_sent = self.bytes_sent = self.cancelled = 0
+
+    def animate(self, session, frames, rate, render):
+        # render turns each frame into the payload the session ships; returns the Animation to iterate
+        anim = Animation(self, session, frames, rate, render, self.fps, self.depth)
+        with self._lock:
+            old = self._sessions.get(session)
+            self._sessions[session] = anim
+        if old is not None:
+            self._cancel(old)
+        anim.future = self._executor.submit(anim._produce)
+        return anim
+
+    def _cancel(self, anim):
+        live = anim.cancel()
+        with self._lock:
+            self.cancelled += live
+            if self._sessions.get(anim.session) is anim:
+                del self._sessions[anim.session]
+
+    def _moved(self, delta):
+        with self._lock:
+            self._active += delta
+
+    def _sent(self, nbytes, latency):
+        now = time.perf_counter()
+        with self._lock:
+            self.frames_sent += 1
+            self.bytes_sent += nbytes
+            self._events.append((now, nbytes))
+            while self._events and self._events[0][0] < now - WINDOW:
+                self._events.popleft()
+            self._latency.append(latency)
+
+    def latencies(self):
+        with self._lock:
+            return list(self._latency)
+
+    def metrics(self):
+        now = time.perf_counter()
+        with self._lock:
+            recent = [b for t, b in self._events if t >= now - WINDOW]
+            waiting = sum(1 for a in self._sessions.values() if a.waiting)
+            return {"active": self._active, "waiting": waiting, "limit": self.max_active,
+                    "frames_per_s": len(recent) / WINDOW, "bytes_per_s": sum(recent) / WINDOW,
+                    "frames_sent": self.frames_sent, "bytes_sent": self.bytes_sent, "cancelled": self.cancelled}
+
+    def shutdown(self):
+        with self._lock:
+            anims = list(self._sessions.values())
+        for anim in anims:
+            anim.cancel()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,634 @@
+import random
+from functools import partial
+
+def bubble_sort(arr):
+    n = len(arr)
+    sorted_idx = []
+    yield arr, [], [], sorted_idx
+    for i in range(n):
+        for j in range(n - i - 1):
+            yield arr, [j, j+1], [], sorted_idx
+            if arr[j] > arr[j + 1]:
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                yield arr, [j, j+1], [], sorted_idx
+        sorted_idx.append(n - i - 1)
+        if n-i-1 == 0: sorted_idx.append(0)
+    yield arr, [], [], list(range(n))
+
+def insertion_sort(arr):
+    n = len(arr)
+    sorted_idx = [0]
+    yield arr, [], [], sorted_idx
+    for i in range(1, n):
+        key, j = arr[i], i - 1
+        while j >= 0 and key < arr[j]:
+            yield arr, [j, j+1], [], sorted_idx
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = key
+        sorted_idx.append(i)
+        yield arr, [j+1], [], sorted_idx
+    yield arr, [], [], list(range(n))
+
+def selection_sort(arr):
+    n = len(arr)
+    sorted_idx = []
+    yield arr, [], [], sorted_idx
+    for i in range(n):
+        min_idx = i
+        for j in range(i + 1, n):
+            yield arr, [min_idx, j], [], sorted_idx
+            if arr[j] < arr[min_idx]:
+                min_idx = j
+        arr[i], arr[min_idx] = arr[min_idx], arr[i]
+        sorted_idx.append(i)
+        yield arr, [], [], sorted_idx
+    yield arr, [], [], list(range(n))
+
+def merge_sort(arr, probe=None, mode="top-down"):
+    if mode != "top-down":
+        yield from MERGE_MODES[mode](arr, probe)
+        return
+    n = len(arr)
+    def merge(arr, l, m, r):
+        if probe is not None:
+            probe.enter("merge")
+            probe.alloc(r - l + 1)
+        L, R = arr[l:m+1], arr[m+1:r+1]
+        i = j = 0
+        k = l
+        while i < len(L) and j < len(R):
+            yield arr, [k], [], []
+            arr[k] = L[i] if L[i] <= R[j] else R[j]
+            i, j = (i+1, j) if L[i] <= R[j] else (i, j+1)
+            k += 1
+        while i < len(L):
+            arr[k] = L[i]
+            i += 1
+            k += 1
+            yield arr, [k-1], [], []
+        while j < len(R):
+            arr[k] = R[j]
+            j += 1
+            k += 1
+            yield arr, [k-1], [], []
+        yield arr, list(range(l, r+1)), [], []
+        if probe is not None:
+            probe.free(r - l + 1)
+            probe.exit()
+    
+    def helper(arr, l, r):
+        if probe is not None:
+            probe.enter("helper")
+        if l < r:
+            m = l + (r - l) // 2
+            yield from helper(arr, l, m)
+            yield from helper(arr, m + 1, r)
+            yield from merge(arr, l, m, r)
+        if probe is not None:
+            probe.exit()
+    
+    yield arr, [], [], []
+    yield from helper(arr, 0, n - 1)
+    yield arr, [], [], list(range(n))
+
+def bottom_up_merge_sort(arr, probe=None):
+    # one buffer for the whole sort: each pass copies arr into it and merges adjacent runs back
+    n = len(arr)
+    buf = [None] * n
+    if probe is not None:
+        probe.alloc(n)
+    yield arr, [], [], []
+    width = 1
+    while width < n:
+        buf[:] = arr
+        for lo in range(0, n - width, 2 * width):
+            mid, hi = lo + width, min(lo + 2 * width, n)
+            if not buf[mid] < buf[mid - 1]:
+                continue
+            if probe is not None:
+                probe.enter("merge")
+            i, j = lo, mid
+            for k in range(lo, hi):
+                if j >= hi or (i < mid and not buf[j] < buf[i]):
+                    arr[k] = buf[i]
+                    i += 1
+                else:
+                    arr[k] = buf[j]
+                    j += 1
+                yield arr, [k], [], []
+            yield arr, list(range(lo, hi)), [], []
+            if probe is not None:
+                probe.exit()
+        width *= 2
+    if probe is not None:
+        probe.free(n)
+    yield arr, [], [], list(range(n))
+
+def reverse(arr, lo, hi):
+    # reverses arr[lo:hi] in place, one swap per frame
+    hi -= 1
+    while lo < hi:
+        arr[lo], arr[hi] = arr[hi], arr[lo]
+        yield arr, [lo, hi], [], []
+        lo, hi = lo + 1, hi - 1
+
+def in_place_merge_sort(arr, probe=None):
+    # no buffer at all: adjacent runs are merged by rotating blocks into place (O(n log^2 n) moves)
+    n = len(arr)
+
+    def merge(arr, lo, mid, hi):
+        if probe is not None:
+            probe.enter("merge")
+        stack = [(lo, mid, hi)]
+        while stack:
+            lo, mid, hi = stack.pop()
+            if lo == mid or mid == hi or not arr[mid] < arr[mid - 1]:
+                continue
+            if hi - lo == 2:
+                arr[lo], arr[mid] = arr[mid], arr[lo]
+                yield arr, [lo, mid], [], []
+                continue
+            # split the longer run in half and find where its middle element lands in the other one
+            if mid - lo >= hi - mid:
+                cut1 = (lo + mid) // 2
+                a, b = mid, hi
+                while a < b:
+                    m = (a + b) // 2
+                    if arr[m] < arr[cut1]:
+                        a = m + 1
+                    else:
+                        b = m
+                cut2 = a
+            else:
+                cut2 = (mid + hi) // 2
+                a, b = lo, mid
+                while a < b:
+                    m = (a + b) // 2
+                    if not arr[cut2] < arr[m]:
+                        a = m + 1
+                    else:
+                        b = m
+                cut1 = a
+            # cut2 can be hi, one past the range; its last element stands in for it
+            yield arr, [cut1, cut2 - 1], [mid], []
+            if probe is not None:
+                probe.enter("rotate")
+            yield from reverse(arr, cut1, mid)
+            yield from reverse(arr, mid, cut2)
+            yield from reverse(arr, cut1, cut2)
+            if probe is not None:
+                probe.exit()
+            new_mid = cut1 + cut2 - mid
+            stack.append((new_mid, cut2, hi))
+            stack.append((lo, cut1, new_mid))
+        if probe is not None:
+            probe.exit()
+
+    yield arr, [], [], []
+    width = 1
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            hi = min(lo + 2 * width, n)
+            yield from merge(arr, lo, lo + width, hi)
+            yield arr, list(range(lo, hi)), [], []
+        width *= 2
+    yield arr, [], [], list(range(n))
+
+MERGE_MODES = {"bottom-up": bottom_up_merge_sort, "in-place": in_place_merge_sort}
+
+def quick_sort(arr, probe=None, pivot="median3", three_way=False, introsort=True, seed=0):
+    # iterative: the larger side goes on an explicit stack and the loop carries on with the smaller one,
+    # so the stack stays O(log n) deep whatever the pivots do. Past 2*log2(n) levels a range is heap sorted.
+    n = len(arr)
+    sorted_idx = []
+    rng = random.Random(seed)
+
+    def median3(arr, a, b, c):
+        yield arr, [a, b, c], [], sorted_idx
+        if arr[b] < arr[a]:
+            a, b = b, a
+        if arr[c] < arr[b]:
+            b = c if not arr[c] < arr[a] else a
+        return b
+
+    def choose(arr, low, high):
+        if pivot == "last":
+            return high
+        if pivot == "random":
+            return rng.randint(low, high)
+        if pivot == "median3" or (pivot == "ninther" and high - low < 40):
+            # order the three samples in place as well, which keeps reversed runs from degenerating
+            mid = (low + high) // 2
+            for a, b in ((low, mid), (mid, high), (low, mid)):
+                yield arr, [a, b], [], sorted_idx
+                if arr[b] < arr[a]:
+                    arr[a], arr[b] = arr[b], arr[a]
+                    yield arr, [a, b], [], sorted_idx
+            return mid
+        if pivot == "ninther":
+            step = (high - low) // 8
+            mid = (low + high) // 2
+            return (yield from median3(arr, (yield from median3(arr, low, low + step, low + 2 * step)),
+                                       (yield from median3(arr, mid - step, mid, mid + step)),
+                                       (yield from median3(arr, high - 2 * step, high - step, high))))
+        raise ValueError(f"unknown pivot strategy {pivot!r}")
+
+    def partition(arr, low, high):
+        # Hoare-style scans from both ends that stop on keys equal to the pivot, so duplicates split evenly
+        if probe is not None:
+            probe.enter("partition")
+        p = yield from choose(arr, low, high)
+        if p != high:
+            arr[p], arr[high] = arr[high], arr[p]
+            yield arr, [p, high], [high], sorted_idx
+        pivot_value = arr[high]
+        i, j = low, high - 1
+        while True:
+            yield arr, [i, j], [high], sorted_idx
+            while arr[i] < pivot_value:
+                i += 1
+                yield arr, [i, j], [high], sorted_idx
+            while j > i and pivot_value < arr[j]:
+                j -= 1
+                yield arr, [i, j], [high], sorted_idx
+            if i >= j:
+                break
+            arr[i], arr[j] = arr[j], arr[i]
+            yield arr, [i, j], [high], sorted_idx
+            i, j = i + 1, j - 1
+        arr[i], arr[high] = arr[high], arr[i]
+        yield arr, [i, high], [i], sorted_idx
+        if probe is not None:
+            probe.exit()
+        return i, i
+
+    def partition3(arr, low, high):
+        # Bentley-McIlroy: keys equal to the pivot are parked at both ends during the scan and swapped into
+        # the middle afterwards; returns the bounds of the block equal to the pivot
+        if probe is not None:
+            probe.enter("partition")
+        p = yield from choose(arr, low, high)
+        if p != low:
+            arr[p], arr[low] = arr[low], arr[p]
+            yield arr, [p, low], [low], sorted_idx
+        pivot_value = arr[low]
+        i, j, lt, gt = low, high + 1, low, high + 1
+        while True:
+            i += 1
+            while i < high and arr[i] < pivot_value:
+                yield arr, [i], [low], sorted_idx
+                i += 1
+            j -= 1
+            while j > low and pivot_value < arr[j]:
+                yield arr, [j], [low], sorted_idx
+                j -= 1
+            yield arr, [i, j], [low], sorted_idx
+            if i >= j:
+                if i == j and not arr[i] < pivot_value and not pivot_value < arr[i]:
+                    lt += 1
+                    arr[lt], arr[i] = arr[i], arr[lt]
+                    yield arr, [lt, i], [low], sorted_idx
+                break
+            arr[i], arr[j] = arr[j], arr[i]
+            yield arr, [i, j], [low], sorted_idx
+            if not arr[i] < pivot_value and not pivot_value < arr[i]:
+                lt += 1
+                arr[lt], arr[i] = arr[i], arr[lt]
+                yield arr, [lt, i], [low], sorted_idx
+            if not arr[j] < pivot_value and not pivot_value < arr[j]:
+                gt -= 1
+                arr[gt], arr[j] = arr[j], arr[gt]
+                yield arr, [j, gt], [low], sorted_idx
+        i = j + 1
+        for k in range(low, lt + 1):
+            arr[k], arr[j] = arr[j], arr[k]
+            yield arr, [k, j], [j], sorted_idx
+            j -= 1
+        for k in range(high, gt - 1, -1):
+            arr[k], arr[i] = arr[i], arr[k]
+            yield arr, [k, i], [i], sorted_idx
+            i += 1
+        if probe is not None:
+            probe.exit()
+        return j + 1, i - 1
+
+    split = partition3 if three_way else partition
+    limit = 2 * n.bit_length()
+    stack = [(0, n - 1, 0)]
+    yield arr, [], [], sorted_idx
+    while stack:
+        low, high, depth = stack.pop()
+        while low < high:
+            if probe is not None:
+                probe.depth(depth + 1)
+            if introsort and depth > limit:
+                if probe is not None:
+                    probe.enter("heap sort")
+                yield from heap_range(arr, low, high + 1, sorted_idx, probe)
+                if probe is not None:
+                    probe.exit()
+                sorted_idx.append(low)
+                yield arr, [], [], sorted_idx
+                break
+            lt, gt = yield from split(arr, low, high)
+            sorted_idx.extend(range(lt, gt + 1))
+            depth += 1
+            if lt - low < high - gt:
+                stack.append((gt + 1, high, depth))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1, depth))
+                low = gt + 1
+        else:
+            if low == high:
+                sorted_idx.append(low)
+                yield arr, [], [], sorted_idx
+    yield arr, [], [], list(range(n))
+
+def sift_down(arr, base, root, end, sorted_idx):
+    # max-heap rooted at arr[base]; root and end are offsets from base
+    while 2 * root + 1 < end:
+        child = 2 * root + 1
+        if child + 1 < end:
+            yield arr, [base+child, base+child+1], [base+root], sorted_idx
+            if arr[base + child] < arr[base + child + 1]:
+                child += 1
+        yield arr, [base+root, base+child], [base+root], sorted_idx
+        if not arr[base + root] < arr[base + child]:
+            return
+        arr[base + root], arr[base + child] = arr[base + child], arr[base + root]
+        yield arr, [base+root, base+child], [base+child], sorted_idx
+        root = child
+
+def heap_range(arr, lo, hi, sorted_idx, probe=None):
+    n = hi - lo
+    if probe is not None:
+        probe.enter("heapify")
+    for start in range(n // 2 - 1, -1, -1):
+        yield from sift_down(arr, lo, start, n, sorted_idx)
+    if probe is not None:
+        probe.exit()
+        probe.enter("extract")
+    for end in range(n - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        sorted_idx.append(lo + end)
+        yield arr, [lo, lo+end], [], sorted_idx
+        yield from sift_down(arr, lo, 0, end, sorted_idx)
+    if probe is not None:
+        probe.exit()
+
+def heap_sort(arr, probe=None):
+    n = len(arr)
+    sorted_idx = []
+    yield arr, [], [], sorted_idx
+    yield from heap_range(arr, 0, n, sorted_idx, probe)
+    yield arr, [], [], list(range(n))
+
+def shell_gaps(kind, n):
+    if kind == "shell":
+        gaps, g = [], n // 2
+        while g > 0:
+            gaps.append(g)
+            g //= 2
+        return gaps or [1]
+    if kind == "knuth":
+        gaps, g = [1], 4
+        while g < max(n // 3, 2):
+            gaps.append(g)
+            g = 3 * g + 1
+        return gaps[::-1]
+    if kind == "ciura":
+        gaps = [1, 4, 10, 23, 57, 132, 301, 701]
+        while gaps[-1] * 9 // 4 < n:
+            gaps.append(gaps[-1] * 9 // 4)
+        return [g for g in reversed(gaps) if g < n] or [1]
+    raise ValueError(f"unknown gap sequence {kind!r}")
+
+def shell_sort(arr, gaps="ciura"):
+    n = len(arr)
+    yield arr, [], [], []
+    for gap in shell_gaps(gaps, n):
+        for i in range(gap, n):
+            key, j = arr[i], i
+            while j >= gap and key < arr[j - gap]:
+                yield arr, [j-gap, j], [], []
+                arr[j] = arr[j - gap]
+                j -= gap
+            arr[j] = key
+            yield arr, [j], [], []
+    yield arr, [], [], list(range(n))
+
+def counting_sort(arr):
+    n = len(arr)
+    sorted_idx = []
+    yield arr, [], [], sorted_idx
+    if n == 0:
+        return
+    lo = min(arr)
+    counts = [0] * (max(arr) - lo + 1)
+    for i in range(n):
+        counts[arr[i] - lo] += 1
+        yield arr, [i], [], sorted_idx
+    for v in range(1, len(counts)):
+        counts[v] += counts[v - 1]
+    src = arr[:]
+    for i in range(n - 1, -1, -1):
+        counts[src[i] - lo] -= 1
+        pos = counts[src[i] - lo]
+        arr[pos] = src[i]
+        sorted_idx.append(pos)
+        yield arr, [pos], [], sorted_idx
+    yield arr, [], [], list(range(n))
+
+def radix_sort(arr, base=10):
+    n = len(arr)
+    yield arr, [], [], []
+    if n == 0:
+        return
+    lo = min(arr)
+    span, exp = max(arr) - lo, 1
+    while True:
+        counts = [0] * base
+        for i in range(n):
+            counts[(arr[i] - lo) // exp % base] += 1
+            yield arr, [i], [], []
+        for d in range(1, base):
+            counts[d] += counts[d - 1]
+        src = arr[:]
+        for i in range(n - 1, -1, -1):
+            d = (src[i] - lo) // exp % base
+            counts[d] -= 1
+            arr[counts[d]] = src[i]
+            yield arr, [counts[d]], [], []
+        exp *= base
+        if span // exp == 0:
+            break
+    yield arr, [], [], list(range(n))
+
+MIN_GALLOP = 7
+
+def min_run_length(n):
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+def gallop(seq, lo, hi, key, right):
+    # first index in seq[lo:hi] holding an element > key (right=True) or >= key (right=False),
+    # probing lo, lo+1, lo+2, lo+4, ... before a binary search inside the bracket
+    a, b, step = lo, lo, 1
+    while b < hi and (not key < seq[b] if right else seq[b] < key):
+        a, b = b + 1, lo + step
+        step *= 2
+    b = min(b, hi)
+    while a < b:
+        m = (a + b) // 2
+        if not key < seq[m] if right else seq[m] < key:
+            a = m + 1
+        else:
+            b = m
+    return a
+
+def tim_sort(arr, min_run=None, probe=None):
+    n = len(arr)
+    min_run = min_run or min_run_length(n)
+    runs = []
+
+    def insertion(arr, lo, start, hi):
+        for i in range(start, hi):
+            key, a, b = arr[i], lo, i
+            while a < b:
+                m = (a + b) // 2
+                yield arr, [m, i], [], []
+                if key < arr[m]:
+                    b = m
+                else:
+                    a = m + 1
+            for j in range(i, a, -1):
+                arr[j] = arr[j - 1]
+                yield arr, [j-1, j], [], []
+            arr[a] = key
+            yield arr, [a], [], []
+
+    def merge(arr, lo, mid, hi):
+        if probe is not None:
+            probe.enter("merge")
+            probe.alloc(mid - lo)
+        tmp = arr[lo:mid]
+        i, j, k = 0, mid, lo
+        wins_left = wins_right = 0
+        while i < len(tmp) and j < hi:
+            yield arr, [k, j], [], []
+            if arr[j] < tmp[i]:
+                arr[k] = arr[j]
+                j, wins_right, wins_left = j + 1, wins_right + 1, 0
+            else:
+                arr[k] = tmp[i]
+                i, wins_left, wins_right = i + 1, wins_left + 1, 0
+            k += 1
+            if wins_left < MIN_GALLOP and wins_right < MIN_GALLOP:
+                continue
+            if probe is not None:
+                probe.enter("gallop")
+            # one side keeps winning: copy whole stretches found by exponential search until both slow down
+            while i < len(tmp) and j < hi:
+                take_left = gallop(tmp, i, len(tmp), arr[j], True) - i
+                for _ in range(take_left):
+                    arr[k] = tmp[i]
+                    i, k = i + 1, k + 1
+                    yield arr, [k-1], [], []
+                if i == len(tmp):
+                    break
+                take_right = gallop(arr, j, hi, tmp[i], False) - j
+                for _ in range(take_right):
+                    arr[k] = arr[j]
+                    j, k = j + 1, k + 1
+                    yield arr, [k-1], [], []
+                if take_left < MIN_GALLOP and take_right < MIN_GALLOP:
+                    break
+            if probe is not None:
+                probe.exit()
+            wins_left = wins_right = 0
+        while i < len(tmp):
+            arr[k] = tmp[i]
+            i, k = i + 1, k + 1
+            yield arr, [k-1], [], []
+        yield arr, list(range(lo, hi)), [], []
+        if probe is not None:
+            probe.free(mid - lo)
+            probe.exit()
+
+    def collapse(arr, force):
+        # keeps run lengths on the stack shrinking faster than Fibonacci, as Timsort does
+        while len(runs) > 1:
+            k = len(runs) - 2
+            if force or (k > 0 and runs[k-1][1] <= runs[k][1] + runs[k+1][1]) or (k > 1 and runs[k-2][1] <= runs[k-1][1] + runs[k][1]):
+                if k > 0 and runs[k-1][1] < runs[k+1][1]:
+                    k -= 1
+            elif runs[k][1] > runs[k+1][1]:
+                return
+            (lo, a), (mid, b) = runs[k], runs[k+1]
+            runs[k:k+2] = [(lo, a + b)]
+            yield from merge(arr, lo, mid, mid + b)
+
+    yield arr, [], [], []
+    lo = 0
+    while lo < n:
+        if probe is not None:
+            probe.enter("runs")
+        hi = lo + 1
+        if hi < n:
+            yield arr, [lo, hi], [], []
+            descending = arr[hi] < arr[lo]
+            hi += 1
+            while hi < n:
+                yield arr, [hi-1, hi], [], []
+                if (arr[hi] < arr[hi - 1]) != descending:
+                    break
+                hi += 1
+            if descending:
+                yield from reverse(arr, lo, hi)
+        end = min(n, lo + min_run)
+        if hi < end:
+            yield from insertion(arr, lo, hi, end)
+            hi = end
+        if probe is not None:
+            probe.exit()
+        runs.append((lo, hi - lo))
+        yield from collapse(arr, False)
+        lo = hi
+    yield from collapse(arr, True)
+    yield arr, [], [], list(range(n))
+
+ALGORITHMS = {"Bubble Sort": bubble_sort, "Insertion Sort": insertion_sort, "Selection Sort": selection_sort, "Merge Sort": merge_sort, "Quick Sort": quick_sort,
+              "Heap Sort": heap_sort, "Shell Sort": shell_sort, "Counting Sort": counting_sort, "Radix Sort (LSD)": radix_sort, "Tim Sort": tim_sort}
+
+# named keyword presets per algorithm; the first entry of each is what the plain registry entry does
+VARIANTS = {
+    "Quick Sort": {"Introsort, median of 3": {}, "Introsort, ninther": {"pivot": "ninther"}, "Introsort, random pivot": {"pivot": "random"},
+                   "Three-way, median of 3": {"three_way": True}, "Classic (last element)": {"pivot": "last", "introsort": False}},
+    "Merge Sort": {"Top-down": {}, "Bottom-up, one buffer": {"mode": "bottom-up"}, "In-place rotations": {"mode": "in-place"}},
+    "Shell Sort": {"Ciura gaps": {"gaps": "ciura"}, "Knuth gaps": {"gaps": "knuth"}, "Shell gaps": {"gaps": "shell"}},
+    "Radix Sort (LSD)": {"Base 10": {"base": 10}, "Base 16": {"base": 16}, "Base 256": {"base": 256}},
+    "Tim Sort": {"Standard min run": {}, "Min run 8": {"min_run": 8}},
+}
+
+# algorithms that keep equal keys in input order, in every variant; the rest may reorder them, which only
+# shows once the keys stand for records (see records.py)
+# every algorithm, then "Name:Variant" for each non-default preset
+SPECS = [spec for name in ALGORITHMS for spec in [name] + [f"{name}:{v}" for v in list(VARIANTS.get(name, ()))[1:]]]
+STABLE = {"Bubble Sort", "Insertion Sort", "Merge Sort", "Counting Sort", "Radix Sort (LSD)", "Tim Sort"}
+
+def resolve(name, variant=None):
+    algorithm = ALGORITHMS[name]
+    options = VARIANTS.get(name, {}).get(variant) if variant else None
+    return partial(algorithm, **options) if options else algorithm
+
+def lookup(spec):
+    # "Shell Sort" or "Shell Sort:Knuth gaps"
+    name, _, variant = spec.partition(":")
+    if name not in ALGORITHMS or (variant and variant not in VARIANTS.get(name, ())):
+        raise ValueError(f"unknown algorithm {spec!r}")
+    return resolve(name, variant or None)
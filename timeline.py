@@ -0,0 +1,79 @@
+import threading
+from math import ceil, isqrt
+
+import numpy as np
+
+from tracing import SWAP, WRITE, SORTED, apply_events
+
+# Random access into a recorded Trace. The array and the sorted list are snapshotted every K steps, and the
+# trace's own SWAP/WRITE/SORTED/CLEAR events are the deltas between snapshots, so any step is rebuilt from the
+# nearest snapshot at or before it in at most K steps. K grows with n so the snapshots stay within budget.
+# One Timeline may be shared by every session scrubbing the same trace, so the seek cursor is behind a lock.
+
+SNAPSHOT_BYTES = 64 << 20
+
+
+def replay(ops, a, b, lo, hi, arr, sorted_idx):
+    # applies the state events among events lo..hi of numpy columns; view events are skipped without a
+    # Python loop. Shared with tracecache.TraceFile
+    sel = np.flatnonzero(ops[lo:hi] >= SWAP) + lo
+    for op, x, y in zip(ops[sel].tolist(), a[sel].tolist(), b[sel].tolist()):
+        if op == SWAP:
+            arr[x], arr[y] = arr[y], arr[x]
+        elif op == WRITE:
+            arr[x] = y
+        elif op == SORTED:
+            sorted_idx.append(x)
+        else:
+            sorted_idx.clear()
+
+
+class Timeline:
+    def __init__(self, trace, budget=SNAPSHOT_BYTES):
+        # the trace must be complete: its columns are read through buffers, without copying
+        self.trace = trace
+        self.n, self.steps = len(trace.initial), len(trace)
+        self._ops = np.frombuffer(trace.ops, np.uint8)
+        self._a = np.frombuffer(trace.a, np.int32)
+        self._b = np.frombuffer(trace.b, np.int64)
+        # worst case, each snapshot holds n values and n sorted indices
+        self.K = max(64, isqrt(self.steps), ceil(self.steps * self.n * 16 / budget))
+        arr, sorted_idx = trace.initial.tolist(), []
+        self._snapshots = []
+        for lo in range(0, self.steps, self.K):
+            self._snapshots.append((np.array(arr, np.int64), np.array(sorted_idx, np.int64)))
+            self._replay(arr, sorted_idx, lo, min(lo + self.K, self.steps))
+        self._pos, self._arr, self._sorted = -1, None, None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.steps
+
+    @property
+    def nbytes(self):
+        return sum(v.nbytes + s.nbytes for v, s in self._snapshots)
+
+    def _replay(self, arr, sorted_idx, start, stop):
+        offsets = self.trace.offsets
+        replay(self._ops, self._a, self._b, offsets[start], offsets[stop], arr, sorted_idx)
+
+    def frame_at(self, step):
+        # the frame the generator yielded at step; stepping forward from the last seek skips the snapshot
+        if step < 0:
+            step += self.steps
+        if not 0 <= step < self.steps:
+            raise IndexError("trace step out of range")
+        with self._lock:
+            return self._seek(step)
+
+    def _seek(self, step):
+        if self._pos < 0 or not self._pos < step <= self._pos + self.K:
+            c = step // self.K
+            values, sorted_idx = self._snapshots[c]
+            self._arr, self._sorted, self._pos = values.tolist(), sorted_idx.tolist(), c * self.K - 1
+        self._replay(self._arr, self._sorted, self._pos + 1, step)
+        offsets = self.trace.offsets
+        highlights, pivots = apply_events(self.trace.ops, self.trace.a, self.trace.b, offsets[step], offsets[step + 1],
+                                          self._arr, self._sorted)
+        self._pos = step
+        return list(self._arr), highlights, pivots, list(self._sorted)
@@ -0,0 +1,277 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+import sorts
+import tracing
+from timeline import replay
+from tracing import Trace, apply_events, record
+
+# Traces are content-addressed: the key hashes the algorithm spec, the input array and the source of
+# sorts.py and tracing.py, so neither an edited generator nor a change to the event encoding ever serves a
+# stale trace. Recent traces live in memory under a byte budget; with a directory set every trace is also
+# written there as a chunked trace file.
+
+_CODE = hashlib.sha256(b"".join(open(m.__file__, "rb").read() for m in (sorts, tracing))).digest()
+
+MAGIC = b"DSATRC1\0"
+# files kept open (and memory-mapped) at once by a TraceCache for seeking; the least recent is closed
+OPEN_FILES = 4
+_HEAD = struct.Struct("<4Q")
+_SPAN = struct.Struct("<2Q")
+_CHUNK = struct.Struct("<3Q")
+
+
+def trace_key(spec, arr):
+    h = hashlib.sha256(_CODE)
+    h.update(spec.encode())
+    h.update(b"\0")
+    h.update(_le(array("q", arr)))
+    return h.hexdigest()
+
+
+def _le(col):
+    if sys.byteorder == "big" and col.itemsize > 1:
+        col = array(col.typecode, col)
+        col.byteswap()
+    return col.tobytes()
+
+
+def _col(typecode, raw):
+    col = array(typecode)
+    col.frombytes(raw)
+    if sys.byteorder == "big" and col.itemsize > 1:
+        col.byteswap()
+    return col
+
+
+class TraceFile:
+    # On-disk trace: the steps are cut into chunks, each zlib-compressed on its own and prefixed with the
+    # array and sorted list as they stood when the chunk starts. The file is memory-mapped, so frame_at()
+    # and frames(start) inflate only the chunks they touch. frame_at() keeps the last chunk inflated and a
+    # cursor into it, like Timeline, so scrubbing forward replays only the steps in between.
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a trace file")
+        pos = len(MAGIC)
+        self.n, self.steps, self.chunk, chunks = _HEAD.unpack_from(self._mm, pos)
+        pos += _HEAD.size
+        self._spans = [_SPAN.unpack_from(self._mm, pos + i * _SPAN.size) for i in range(chunks + 1)]
+        self._lock = threading.Lock()
+        self._at, self._cols, self._pos = -1, None, -1
+
+    def __len__(self):
+        return self.steps
+
+    @property
+    def nbytes(self):
+        return len(self._mm)
+
+    @property
+    def K(self):
+        # steps between stored states, as Timeline.K: a seek replays at most this many
+        return self.chunk
+
+    def close(self):
+        with self._lock:
+            self._cols = None
+            self._mm.close()
+
+    @staticmethod
+    def write(path, trace, chunk=None):
+        n, steps = len(trace.initial), len(trace)
+        # a quarter of the array's length in steps keeps the stored arrays to ~4 bytes of raw data per step
+        # while a seek replays at most a chunk
+        chunk = chunk or max(4096, n // 4)
+        arr, sorted_idx = trace.initial.tolist(), []
+        blobs = []
+        for lo in range(0, steps, chunk):
+            hi = min(lo + chunk, steps)
+            e0, e1 = trace.offsets[lo], trace.offsets[hi]
+            offsets = array("Q", (o - e0 for o in trace.offsets[lo:hi + 1]))
+            body = b"".join((_CHUNK.pack(len(sorted_idx), hi - lo, e1 - e0), _le(array("q", arr)), _le(array("q", sorted_idx)),
+                             _le(offsets), _le(trace.ops[e0:e1]), _le(trace.a[e0:e1]), _le(trace.b[e0:e1])))
+            blobs.append(zlib.compress(body, 1))
+            for step in range(lo, hi):
+                trace._apply(arr, sorted_idx, step)
+        blobs.append(zlib.compress(_le(array("q", trace.final)), 1))
+        pos = len(MAGIC) + _HEAD.size + _SPAN.size * len(blobs)
+        spans = []
+        for blob in blobs:
+            spans.append(_SPAN.pack(pos, len(blob)))
+            pos += len(blob)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + _HEAD.pack(n, steps, chunk, len(blobs) - 1) + b"".join(spans) + b"".join(blobs))
+        os.replace(tmp, path)
+
+    def _inflate(self, c):
+        off, size = self._spans[c]
+        return zlib.decompress(self._mm[off:off + size])
+
+    def _load(self, c):
+        raw = self._inflate(c)
+        nsorted, nsteps, nevents = _CHUNK.unpack_from(raw)
+        pos, cols = _CHUNK.size, []
+        for typecode, count in (("q", self.n), ("q", nsorted), ("Q", nsteps + 1), ("B", nevents), ("i", nevents), ("q", nevents)):
+            size = array(typecode).itemsize * count
+            cols.append(_col(typecode, raw[pos:pos + size]))
+            pos += size
+        return cols
+
+    @property
+    def final(self):
+        return _col("q", self._inflate(len(self._spans) - 1)).tolist()
+
+    def frames(self, start=0, stop=None):
+        stop = self.steps if stop is None else min(stop, self.steps)
+        c = start // self.chunk if start < self.steps else len(self._spans) - 1
+        while c * self.chunk < stop:
+            vals, sorted_idx, offsets, ops, a, b = self._load(c)
+            arr, sorted_idx = vals.tolist(), sorted_idx.tolist()
+            base = c * self.chunk
+            for s in range(len(offsets) - 1):
+                highlights, pivots = apply_events(ops, a, b, offsets[s], offsets[s + 1], arr, sorted_idx)
+                if base + s >= stop:
+                    return
+                if base + s >= start:
+                    yield arr, highlights, pivots, sorted_idx
+            c += 1
+
+    def frame_at(self, step):
+        if step < 0:
+            step += self.steps
+        if not 0 <= step < self.steps:
+            raise IndexError("trace step out of range")
+        with self._lock:
+            return self._seek(step)
+
+    def _seek(self, step):
+        c = step // self.chunk
+        if c != self._at:
+            vals, sorted_idx, offsets, ops, a, b = self._load(c)
+            self._cols = (vals, sorted_idx, offsets, ops, a, b, np.frombuffer(ops, np.uint8), np.frombuffer(a, np.int32),
+                          np.frombuffer(b, np.int64))
+            self._at, self._pos = c, -1
+        vals, sorted_idx, offsets, ops, a, b, nops, na, nb = self._cols
+        base = c * self.chunk
+        if self._pos < 0 or step <= self._pos:
+            self._arr, self._sorted, self._pos = vals.tolist(), sorted_idx.tolist(), base - 1
+        replay(nops, na, nb, offsets[self._pos + 1 - base], offsets[step - base], self._arr, self._sorted)
+        highlights, pivots = apply_events(ops, a, b, offsets[step - base], offsets[step - base + 1], self._arr, self._sorted)
+        self._pos = step
+        return list(self._arr), highlights, pivots, list(self._sorted)
+
+    def to_trace(self):
+        trace = Trace(())
+        for c in range(len(self._spans) - 1):
+            vals, _, offsets, ops, a, b = self._load(c)
+            if c == 0:
+                trace.initial = vals
+            base = trace.offsets[-1]
+            trace.offsets.extend(base + o for o in offsets[1:])
+            trace.ops.extend(ops)
+            trace.a.extend(a)
+            trace.b.extend(b)
+        if not trace.initial and self.n:
+            raise ValueError(f"{self.path} has no steps")
+        trace.final = self.final
+        return trace
+
+
+class TraceCache:
+    # Thread-safe; meant to be built once per process and shared by every session (see app.trace_cache)
+    def __init__(self, budget=256 << 20, directory=None):
+        self.budget = budget
+        self.directory = directory
+        self._mem = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._files = OrderedDict()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".trace")
+
+    def get(self, key):
+        with self._lock:
+            trace = self._mem.get(key)
+            if trace is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return trace
+        if self.directory and os.path.exists(self._path(key)):
+            tf = TraceFile(self._path(key))
+            try:
+                trace = tf.to_trace()
+            finally:
+                tf.close()
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(key, trace)
+            return trace
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def open(self, key):
+        # the disk copy without inflating it, for seeks and partial replays. The cache owns the file: callers
+        # share it and must not close it; past OPEN_FILES the least recently opened one is closed
+        if not (self.directory and os.path.exists(self._path(key))):
+            return None
+        with self._lock:
+            tf = self._files.get(key)
+            if tf is not None:
+                self._files.move_to_end(key)
+                return tf
+            tf = self._files[key] = TraceFile(self._path(key))
+            stale = [self._files.popitem(last=False)[1] for _ in range(len(self._files) - OPEN_FILES)]
+        for old in stale:
+            old.close()
+        return tf
+
+    def put(self, key, trace):
+        if self.directory and not os.path.exists(self._path(key)):
+            TraceFile.write(self._path(key), trace)
+        self._remember(key, trace)
+
+    def _remember(self, key, trace):
+        with self._lock:
+            if key in self._mem:
+                self._bytes -= self._mem.pop(key).nbytes
+            if trace.nbytes > self.budget:
+                return
+            self._mem[key] = trace
+            self._bytes += trace.nbytes
+            while self._bytes > self.budget:
+                _, old = self._mem.popitem(last=False)
+                self._bytes -= old.nbytes
+                self.evictions += 1
+
+    def record(self, spec, arr):
+        # the trace of spec run on arr, recorded at most once per process (or once ever, with a directory)
+        key = trace_key(spec, arr)
+        trace = self.get(key)
+        if trace is None:
+            trace = record(sorts.lookup(spec), arr)
+            self.put(key, trace)
+        return trace
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._mem), "bytes": self._bytes, "budget": self.budget}
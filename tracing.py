@@ -0,0 +1,171 @@
+import sys
+from array import array
+from base64 import b64encode
+
+# Event opcodes. State events (SWAP, WRITE, SORTED, CLEAR) persist across steps,
+# view events (COMPARE, RANGE, PIVOT) only describe the step they belong to.
+COMPARE, RANGE, PIVOT, SWAP, WRITE, SORTED, CLEAR = range(7)
+OP_NAMES = ("compare", "range", "pivot", "swap", "write", "sorted", "clear")
+
+
+class _Tracked(list):
+    # list that logs every element write so the recorder never has to diff arrays
+    __slots__ = ("log",)
+
+    def __setitem__(self, k, v):
+        if isinstance(k, slice):
+            idx = range(*k.indices(len(self)))
+            v = list(v)
+            if len(v) != len(idx):
+                raise ValueError("traced arrays cannot change length")
+            for i, x in zip(idx, v):
+                self.log.append((i, x, list.__getitem__(self, i)))
+            list.__setitem__(self, k, v)
+            return
+        if k < 0:
+            k += len(self)
+        self.log.append((k, v, list.__getitem__(self, k)))
+        list.__setitem__(self, k, v)
+
+
+class Trace:
+    def __init__(self, initial):
+        self.initial = array("q", initial)
+        self.ops = array("B")
+        self.a = array("i")
+        self.b = array("q")
+        self.offsets = array("Q", [0])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        cols = (self.initial, self.ops, self.a, self.b, self.offsets)
+        return sum(len(c) * c.itemsize for c in cols)
+
+    def _emit(self, op, a, b=-1):
+        self.ops.append(op)
+        self.a.append(a)
+        self.b.append(b)
+
+    def capture(self, algorithm):
+        # runs algorithm on a private copy of the initial array, yields its live frames and records them
+        arr = _Tracked(self.initial)
+        arr.log = []
+        log = arr.log
+        shadow, sorted_obj, emit = [], None, self._emit
+        for frame in algorithm(arr):
+            _, highlights, pivots, sorted_indices = frame
+            i, m = 0, len(log)
+            while i < m:
+                k, v, old = log[i]
+                if i + 1 < m:
+                    k2, v2, old2 = log[i + 1]
+                    if v == old2 and v2 == old and (k != k2 or v == v2):
+                        emit(SWAP, k, k2)
+                        i += 2
+                        continue
+                emit(WRITE, k, v)
+                i += 1
+            log.clear()
+            ns, nh = len(sorted_indices), len(shadow)
+            if sorted_indices is sorted_obj and ns >= nh:
+                fresh = sorted_indices[nh:]
+            elif ns >= nh and sorted_indices[:nh] == shadow:
+                fresh = sorted_indices[nh:]
+            else:
+                emit(CLEAR, 0)
+                shadow = []
+                fresh = sorted_indices
+            for s in fresh:
+                emit(SORTED, s)
+            shadow.extend(fresh)
+            sorted_obj = sorted_indices
+            nl = len(highlights)
+            if nl > 2 and highlights[-1] - highlights[0] == nl - 1 and highlights == list(range(highlights[0], highlights[0] + nl)):
+                emit(RANGE, highlights[0], highlights[0] + nl)
+            else:
+                for j in range(0, nl - 1, 2):
+                    emit(COMPARE, highlights[j], highlights[j + 1])
+                if nl % 2:
+                    emit(COMPARE, highlights[-1])
+            for p in pivots:
+                emit(PIVOT, p)
+            self.offsets.append(len(self.ops))
+            yield frame
+        self.final = list(arr)
+
+    def _apply(self, arr, sorted_idx, step):
+        return apply_events(self.ops, self.a, self.b, self.offsets[step], self.offsets[step + 1], arr, sorted_idx)
+
+    def frames(self):
+        # yields frames in the same (arr, highlights, pivots, sorted_indices) shape the generators do
+        arr, sorted_idx = self.initial.tolist(), []
+        for step in range(len(self)):
+            highlights, pivots = self._apply(arr, sorted_idx, step)
+            yield arr, highlights, pivots, sorted_idx
+
+    def frame_at(self, step):
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError("trace step out of range")
+        arr, sorted_idx = self.initial.tolist(), []
+        for s in range(step + 1):
+            highlights, pivots = self._apply(arr, sorted_idx, s)
+        return arr, highlights, pivots, list(sorted_idx)
+
+    def events(self, step):
+        lo, hi = self.offsets[step], self.offsets[step + 1]
+        return [(OP_NAMES[self.ops[e]], self.a[e], self.b[e]) for e in range(lo, hi)]
+
+    def to_payload(self):
+        # base64 little-endian columns for the browser; values and offsets are narrowed to 32 bits
+        cols = {"initial": array("i", self.initial), "ops": self.ops, "a": self.a, "b": array("i", self.b), "offsets": array("I", self.offsets)}
+        out = {"n": len(self.initial), "steps": len(self)}
+        for name, col in cols.items():
+            if sys.byteorder == "big" and col.itemsize > 1:
+                col = array(col.typecode, col)
+                col.byteswap()
+            out[name] = b64encode(col.tobytes()).decode()
+        return out
+
+
+def apply_events(ops, a, b, lo, hi, arr, sorted_idx):
+    # plays events lo..hi onto arr and sorted_idx; returns the step's highlights and pivots
+    highlights, pivots = [], []
+    for e in range(lo, hi):
+        op, x, y = ops[e], a[e], b[e]
+        if op == COMPARE:
+            highlights.append(x)
+            if y >= 0:
+                highlights.append(y)
+        elif op == RANGE:
+            highlights.extend(range(x, y))
+        elif op == PIVOT:
+            pivots.append(x)
+        elif op == SWAP:
+            arr[x], arr[y] = arr[y], arr[x]
+        elif op == WRITE:
+            arr[x] = y
+        elif op == SORTED:
+            sorted_idx.append(x)
+        else:
+            sorted_idx.clear()
+    return highlights, pivots
+
+
+def record(algorithm, arr):
+    trace = Trace(arr)
+    for _ in trace.capture(algorithm):
+        pass
+    return trace
+
+
+def stream(algorithm, arr):
+    # capture() without keeping anything: yields each frame with its events, then forgets them
+    trace = Trace(arr)
+    for frame in trace.capture(algorithm):
+        yield frame, trace.events(0)
+        del trace.ops[:], trace.a[:], trace.b[:], trace.offsets[1:]